@@ -3,22 +3,34 @@ Agentic AI Agents
 ================
 
 Collection of specialized agents for the PetSwipe assembly line architecture.
+
+Agent classes are loaded lazily so workers that only need one agent (for
+example a monitoring-only process) do not pay the import cost of the others.
 """
 
-from .base_agent import BaseAgent
-from .pet_analyzer_agent import PetAnalyzerAgent
-from .user_profiler_agent import UserProfilerAgent
-from .matching_agent import MatchingAgent
-from .recommendation_agent import RecommendationAgent
-from .conversation_agent import ConversationAgent
-from .monitoring_agent import MonitoringAgent
-
-__all__ = [
-    "BaseAgent",
-    "PetAnalyzerAgent",
-    "UserProfilerAgent",
-    "MatchingAgent",
-    "RecommendationAgent",
-    "ConversationAgent",
-    "MonitoringAgent",
-]
+from __future__ import annotations
+
+from importlib import import_module
+from typing import Any
+
+_EXPORTS = {
+    "BaseAgent": ("agentic_ai.agents.base_agent", "BaseAgent"),
+    "PetAnalyzerAgent": ("agentic_ai.agents.pet_analyzer_agent", "PetAnalyzerAgent"),
+    "UserProfilerAgent": ("agentic_ai.agents.user_profiler_agent", "UserProfilerAgent"),
+    "MatchingAgent": ("agentic_ai.agents.matching_agent", "MatchingAgent"),
+    "RecommendationAgent": ("agentic_ai.agents.recommendation_agent", "RecommendationAgent"),
+    "ConversationAgent": ("agentic_ai.agents.conversation_agent", "ConversationAgent"),
+    "MonitoringAgent": ("agentic_ai.agents.monitoring_agent", "MonitoringAgent"),
+}
+
+__all__ = list(_EXPORTS.keys())
+
+
+def __getattr__(name: str) -> Any:
+    if name not in _EXPORTS:
+        raise AttributeError(f"module 'agentic_ai.agents' has no attribute '{name}'")
+    module_name, attr_name = _EXPORTS[name]
+    module = import_module(module_name)
+    value = getattr(module, attr_name)
+    globals()[name] = value
+    return value
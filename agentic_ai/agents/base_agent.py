@@ -6,13 +6,20 @@ Abstract base class for all agents in the assembly line architecture.
 """
 
 from abc import ABC, abstractmethod
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List, Optional
 from dataclasses import dataclass
+import asyncio
+import json
 import logging
 from datetime import datetime
 
+try:
+    import msgpack
+except Exception:  # pragma: no cover - optional dependency
+    msgpack = None
 
-@dataclass
+
+@dataclass(slots=True)
 class AgentState:
     """State object passed between agents in the assembly line."""
 
@@ -34,6 +41,40 @@ class AgentState:
         """Update metadata in the state."""
         self.metadata[key] = value
 
+    def pack(self) -> bytes:
+        """Serialize the state for transport across process boundaries.
+
+        Uses msgpack (binary, faster and smaller than JSON) when available,
+        falling back to UTF-8 JSON.
+        """
+        payload = {
+            "agent_name": self.agent_name,
+            "ts": self.timestamp.timestamp() if self.timestamp else None,
+            "data": self.data,
+            "metadata": self.metadata,
+            "errors": self.errors,
+        }
+        if msgpack:
+            return msgpack.packb(payload, use_bin_type=True, default=str)
+        return json.dumps(payload, default=str).encode("utf-8")
+
+    @classmethod
+    def unpack(cls, buf: bytes) -> "AgentState":
+        """Deserialize a state produced by pack()."""
+        if msgpack:
+            payload = msgpack.unpackb(buf, raw=False)
+        else:
+            payload = json.loads(buf.decode("utf-8"))
+
+        ts = payload.get("ts")
+        return cls(
+            agent_name=payload.get("agent_name", ""),
+            timestamp=datetime.fromtimestamp(ts) if ts is not None else None,
+            data=payload.get("data", {}),
+            metadata=payload.get("metadata", {}),
+            errors=payload.get("errors", []),
+        )
+
 
 class BaseAgent(ABC):
     """
@@ -43,6 +84,9 @@ class BaseAgent(ABC):
     Agents follow the Single Responsibility Principle and are composable.
     """
 
+    # Upper bound on pooled AgentState shells per agent
+    _STATE_POOL_MAX = 32
+
     def __init__(
         self,
         name: str,
@@ -53,6 +97,7 @@ class BaseAgent(ABC):
         self.description = description
         self.config = config or {}
         self.logger = logging.getLogger(f"agent.{name}")
+        self._state_pool: list[AgentState] = []
         self._initialize()
 
     def _initialize(self) -> None:
@@ -72,6 +117,22 @@ class BaseAgent(ABC):
         """
         pass
 
+    async def process_batch(self, states: List[AgentState]) -> List[AgentState]:
+        """
+        Process a batch of states.
+
+        The default implementation overlaps the per-state process() calls;
+        agents with native batching (shared prompts, provider batch
+        endpoints) override this to coalesce work across the batch.
+
+        Args:
+            states: Agent states to process
+
+        Returns:
+            Processed states, in input order
+        """
+        return list(await asyncio.gather(*(self.process(state) for state in states)))
+
     async def execute(self, input_data: Dict[str, Any]) -> Dict[str, Any]:
         """
         Execute the agent with input data.
@@ -82,15 +143,10 @@ class BaseAgent(ABC):
         Returns:
             Output data dictionary
         """
+        state = None
         try:
-            # Create initial state
-            state = AgentState(
-                agent_name=self.name,
-                timestamp=datetime.now(),
-                data=input_data,
-                metadata={},
-                errors=[]
-            )
+            # Create initial state (reusing a pooled shell when available)
+            state = self._acquire_state(input_data)
 
             # Process the state
             result_state = await self.process(state)
@@ -115,6 +171,39 @@ class BaseAgent(ABC):
                 "timestamp": datetime.now().isoformat()
             }
 
+        finally:
+            if state is not None:
+                self._release_state(state)
+
+    def _acquire_state(self, input_data: Dict[str, Any]) -> AgentState:
+        """Take a pooled AgentState shell, or allocate one when the pool is empty."""
+        if self._state_pool:
+            state = self._state_pool.pop()
+            state.agent_name = self.name
+            state.timestamp = datetime.now()
+            state.data = input_data
+            state.metadata = {}
+            state.errors = []
+            return state
+
+        return AgentState(
+            agent_name=self.name,
+            timestamp=datetime.now(),
+            data=input_data,
+            metadata={},
+            errors=[]
+        )
+
+    def _release_state(self, state: AgentState) -> None:
+        """Return a state shell to the pool.
+
+        Only the AgentState object itself is recycled; its data/metadata
+        dicts may still be referenced by callers, so reuse assigns fresh
+        containers instead of clearing them.
+        """
+        if len(self._state_pool) < self._STATE_POOL_MAX:
+            self._state_pool.append(state)
+
     def validate_config(self, required_keys: list[str]) -> bool:
         """
         Validate that required configuration keys are present.
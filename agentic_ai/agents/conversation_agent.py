@@ -6,12 +6,11 @@ Handles natural language conversations with users, answers questions about pets,
 and provides contextual assistance using RAG and conversational AI.
 """
 
+import asyncio
+from collections import deque
 from typing import Dict, Any, List
 from .base_agent import BaseAgent, AgentState
-from langchain.prompts import ChatPromptTemplate
-from langchain.schema import HumanMessage, SystemMessage, AIMessage
-from langchain.memory import ConversationBufferMemory
-from ..utils.llm import build_chat_llm
+from ..utils.cache import SemanticResponseCache
 
 
 class ConversationAgent(BaseAgent):
@@ -32,27 +31,45 @@ class ConversationAgent(BaseAgent):
             config=config
         )
 
+        # LangChain is imported lazily so monitoring- or matching-only
+        # workers never pay its module import cost
+        from langchain.schema import HumanMessage, SystemMessage
+        from ..utils.llm import build_chat_llm
+
+        self._human_message = HumanMessage
+        self._system_message = SystemMessage
+
         self.llm = build_chat_llm(config, "conversation", default_temperature=0.7)
-        self.max_history = (
-            config.get("agents", {}).get("conversation", {}).get("max_history", 20)
+        agent_cfg = config.get("agents", {}).get("conversation", {})
+        self.max_history = agent_cfg.get("max_history", 20)
+        self.max_concurrency = agent_cfg.get("max_concurrency", 8)
+
+        # Two-tier response cache: exact hash hits skip the network entirely,
+        # embedding-similarity hits catch near-duplicate FAQs.
+        self.response_cache = SemanticResponseCache(agent_cfg.get("response_cache", {}))
+        self._embeddings_model = None
+
+        # Context formatters, dispatched by key in one pass per turn
+        self._ctx_formatters = (
+            ("user_profile", self._fmt_profile),
+            ("recommendations", self._fmt_recommendations),
+            ("current_pet", self._fmt_pet),
         )
 
-        # Initialize conversation memory
-        self.memory = ConversationBufferMemory(
-            memory_key="chat_history",
-            return_messages=True
+        # Conversation memory: compact (role, content) tuples in a bounded
+        # deque instead of LangChain message objects
+        self._history: deque = deque(
+            maxlen=self.max_history if self.max_history > 0 else None
         )
 
-        self.conversation_prompt = ChatPromptTemplate.from_messages([
-            ("system", """You are a friendly and knowledgeable pet adoption assistant.
-            Help users find their perfect pet companion by answering questions,
-            providing advice, and guiding them through the adoption process.
-            Be warm, encouraging, and informative.
-
-            Context: {context}
-            """),
-            ("human", "{input}")
-        ])
+        # Static system prefix rendered once; per-turn messages are built
+        # directly so no template work happens on the hot path
+        self._system_prefix = (
+            "You are a friendly and knowledgeable pet adoption assistant. "
+            "Help users find their perfect pet companion by answering questions, "
+            "providing advice, and guiding them through the adoption process. "
+            "Be warm, encouraging, and informative."
+        )
 
     async def process(self, state: AgentState) -> AgentState:
         """
@@ -64,16 +81,51 @@ class ConversationAgent(BaseAgent):
         Returns:
             Updated state with response
         """
-        try:
+        results = await self.process_many([state])
+        return results[0]
+
+    async def process_many(self, states: List[AgentState]) -> List[AgentState]:
+        """
+        Process a batch of conversation states concurrently.
+
+        Prompt formatting happens synchronously up front, then all LLM calls
+        are fanned out with asyncio.gather so network round-trips overlap.
+        Concurrency is bounded by the agent's max_concurrency setting to
+        respect provider rate limits.
+
+        Args:
+            states: Agent states, each with its own conversation data
+
+        Returns:
+            The same states, updated in place with responses or errors
+        """
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        async def _call(user_message, context):
+            async with semaphore:
+                return await self._generate_response(user_message, context)
+
+        prepared = []
+        for state in states:
             user_message = state.data.get("message", "")
             context = state.data.get("context", {})
 
             if not user_message:
                 state.add_error("No message provided")
-                return state
+                continue
+
+            prepared.append((state, user_message, context))
 
-            # Generate response
-            response = await self._generate_response(user_message, context)
+        responses = await asyncio.gather(
+            *[_call(user_message, context) for _, user_message, context in prepared],
+            return_exceptions=True
+        )
+
+        for (state, user_message, _), response in zip(prepared, responses):
+            if isinstance(response, BaseException):
+                self.logger.error(f"Conversation processing failed: {str(response)}")
+                state.add_error(f"Conversation error: {str(response)}")
+                continue
 
             # Update conversation history
             self._update_memory(user_message, response)
@@ -85,14 +137,12 @@ class ConversationAgent(BaseAgent):
             state.update_metadata("conversation_agent_version", "1.0.0")
             state.update_metadata("response_generated", True)
 
-            self.logger.info(f"Generated response for user message")
+        self.logger.info(f"Generated responses for {len(prepared)} user messages")
 
-            return state
+        return states
 
-        except Exception as e:
-            self.logger.error(f"Conversation processing failed: {str(e)}")
-            state.add_error(f"Conversation error: {str(e)}")
-            return state
+    # Batched pipeline stages use the same fan-out path
+    process_batch = process_many
 
     async def _generate_response(
         self,
@@ -109,20 +159,92 @@ class ConversationAgent(BaseAgent):
         Returns:
             AI-generated response
         """
-        # Format context
+        # Exact-tier cache lookup
+        cache_key = SemanticResponseCache.make_key(user_message, context)
+        cached = self.response_cache.get_exact(cache_key)
+        if cached is not None:
+            return cached
+
+        # Semantic-tier cache lookup for near-duplicate questions
+        embedding = await self._embed_message(user_message)
+        if embedding is not None:
+            similar = self.response_cache.find_similar(embedding)
+            if similar is not None:
+                return similar
+
+        # Build messages directly from the cached system prefix
         context_str = self._format_context(context)
-
-        # Format prompt
-        messages = self.conversation_prompt.format_messages(
-            context=context_str,
-            input=user_message
-        )
+        messages = [
+            self._system_message(content=f"{self._system_prefix}\n\nContext: {context_str}"),
+            self._human_message(content=user_message),
+        ]
 
         # Get response
         response = await self.llm.apredict_messages(messages)
 
+        self.response_cache.put(cache_key, response.content, embedding)
+
         return response.content
 
+    async def stream_response(self, user_message: str, context: Dict[str, Any]):
+        """
+        Stream a response chunk-by-chunk as the LLM generates it.
+
+        Cache hits yield the full cached response immediately; otherwise
+        chunks are yielded as they arrive and memory/cache are updated once
+        the generation completes.
+
+        Args:
+            user_message: User's message
+            context: Additional context (recommendations, pet data, etc.)
+
+        Yields:
+            Response text chunks
+        """
+        cache_key = SemanticResponseCache.make_key(user_message, context)
+        cached = self.response_cache.get_exact(cache_key)
+        if cached is not None:
+            self._update_memory(user_message, cached)
+            yield cached
+            return
+
+        context_str = self._format_context(context)
+        messages = [
+            self._system_message(content=f"{self._system_prefix}\n\nContext: {context_str}"),
+            self._human_message(content=user_message),
+        ]
+
+        parts = []
+        async for chunk in self.llm.astream(messages):
+            text = chunk.content
+            if text:
+                parts.append(text)
+                yield text
+
+        response = "".join(parts)
+        self._update_memory(user_message, response)
+        self.response_cache.put(cache_key, response)
+
+    async def _embed_message(self, user_message: str):
+        """
+        Embed a user message for the semantic cache tier.
+
+        Returns None when the cache is disabled or embeddings are unavailable,
+        in which case only the exact tier is used.
+        """
+        if not self.response_cache.enabled:
+            return None
+
+        try:
+            if self._embeddings_model is None:
+                from ..utils.llm import build_embeddings
+
+                self._embeddings_model = build_embeddings(self.config)
+            return await self._embeddings_model.aembed_query(user_message)
+        except Exception as e:  # pragma: no cover - depends on provider availability
+            self.logger.debug(f"Semantic cache embedding unavailable: {str(e)}")
+            return None
+
     def _format_context(self, context: Dict[str, Any]) -> str:
         """
         Format context for the conversation.
@@ -133,32 +255,30 @@ class ConversationAgent(BaseAgent):
         Returns:
             Formatted context string
         """
-        context_parts = []
-
-        # Add user profile info
-        if "user_profile" in context:
-            profile = context["user_profile"]
-            preferences = profile.get("preferences", {})
-            context_parts.append(
-                f"User prefers: {', '.join(preferences.get('pet_types', []))}"
-            )
-
-        # Add recommendations
-        if "recommendations" in context:
-            recs = context["recommendations"][:3]
-            pet_names = [r.get("pet_name", "Unknown") for r in recs]
-            context_parts.append(
-                f"Current recommendations: {', '.join(pet_names)}"
-            )
-
-        # Add pet info if discussing specific pet
-        if "current_pet" in context:
-            pet = context["current_pet"]
-            context_parts.append(
-                f"Discussing: {pet.get('name')} - {pet.get('type')}"
-            )
-
-        return "\n".join(context_parts) if context_parts else "No specific context"
+        parts = []
+        for key, formatter in self._ctx_formatters:
+            value = context.get(key)
+            if value is not None:
+                parts.append(formatter(value))
+
+        return "\n".join(parts) if parts else "No specific context"
+
+    @staticmethod
+    def _fmt_profile(profile: Dict[str, Any]) -> str:
+        """Format user profile context."""
+        preferences = profile.get("preferences", {})
+        return f"User prefers: {', '.join(preferences.get('pet_types', []))}"
+
+    @staticmethod
+    def _fmt_recommendations(recommendations: List[Dict[str, Any]]) -> str:
+        """Format current recommendations context."""
+        pet_names = (r.get("pet_name", "Unknown") for r in recommendations[:3])
+        return f"Current recommendations: {', '.join(pet_names)}"
+
+    @staticmethod
+    def _fmt_pet(pet: Dict[str, Any]) -> str:
+        """Format the pet currently under discussion."""
+        return f"Discussing: {pet.get('name')} - {pet.get('type')}"
 
     def _update_memory(self, user_message: str, response: str) -> None:
         """
@@ -168,17 +288,8 @@ class ConversationAgent(BaseAgent):
             user_message: User's message
             response: AI's response
         """
-        self.memory.chat_memory.add_user_message(user_message)
-        self.memory.chat_memory.add_ai_message(response)
-        self._trim_memory()
-
-    def _trim_memory(self) -> None:
-        """Trim memory to configured max history."""
-        if self.max_history <= 0:
-            return
-        messages = self.memory.chat_memory.messages
-        if len(messages) > self.max_history:
-            self.memory.chat_memory.messages = messages[-self.max_history :]
+        self._history.append(("user", user_message))
+        self._history.append(("assistant", response))
 
     def _get_history(self) -> List[Dict[str, str]]:
         """
@@ -187,13 +298,7 @@ class ConversationAgent(BaseAgent):
         Returns:
             List of conversation messages
         """
-        history = []
-        for message in self.memory.chat_memory.messages:
-            if isinstance(message, HumanMessage):
-                history.append({"role": "user", "content": message.content})
-            elif isinstance(message, AIMessage):
-                history.append({"role": "assistant", "content": message.content})
-        return history
+        return [{"role": role, "content": content} for role, content in self._history]
 
     async def answer_question(
         self,
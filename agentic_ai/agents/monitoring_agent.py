@@ -6,10 +6,22 @@ Monitors system performance, tracks metrics, logs events, and provides
 observability for the agentic AI pipeline.
 """
 
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional
 from .base_agent import BaseAgent, AgentState
+import csv
+import io
+from collections import Counter, deque
 from datetime import datetime
+from itertools import islice
 import json
+import queue
+import threading
+import time
+
+try:
+    import orjson
+except Exception:  # pragma: no cover - optional dependency
+    orjson = None
 
 
 class MonitoringAgent(BaseAgent):
@@ -30,8 +42,26 @@ class MonitoringAgent(BaseAgent):
             config=config
         )
 
-        self.metrics_store = []
-        self.event_log = []
+        # Bounded ring buffers: long-running pipelines must not grow without limit
+        ring_size = config.get("metrics_ring", 10_000)
+        self.metrics_store: deque = deque(maxlen=ring_size)
+        self.event_log: deque = deque(maxlen=ring_size)
+
+        # Running aggregates over the ring, maintained incrementally on
+        # append/eviction so summaries are O(1)
+        self._running = {"count": 0, "success": 0, "time_sum": 0.0, "errors": 0}
+
+        # Monotonic clock anchor: records carry cheap monotonic timestamps and
+        # are only formatted to ISO strings on export
+        self._t0_wall = time.time()
+        self._t0_mono = time.monotonic_ns()
+
+        # Metric writes happen on a background consumer thread so the request
+        # path only pays for a queue put
+        self._queue: queue.Queue = queue.Queue()
+        self._writer = threading.Thread(target=self._drain, daemon=True)
+        self._writer.start()
+
         self.performance_thresholds = config.get("thresholds", {
             "max_processing_time": 5.0,  # seconds
             "min_success_rate": 0.95,
@@ -91,7 +121,7 @@ class MonitoringAgent(BaseAgent):
             Metrics dictionary
         """
         metrics = {
-            "timestamp": datetime.now().isoformat(),
+            "ts_ns": time.monotonic_ns(),
             "pipeline_id": execution_data.get("pipeline_id", "unknown"),
             "agents_executed": execution_data.get("agents_executed", []),
             "total_processing_time": execution_data.get("total_time", 0.0),
@@ -109,11 +139,48 @@ class MonitoringAgent(BaseAgent):
                 "errors": agent_result.get("errors", [])
             }
 
-        # Store metrics
-        self.metrics_store.append(metrics)
+        # Store metrics off the request path
+        self._queue.put_nowait(metrics)
 
         return metrics
 
+    def _drain(self) -> None:
+        """Background consumer: move queued metrics into the ring buffer."""
+        while True:
+            metrics = self._queue.get()
+            try:
+                self._store_metrics(metrics)
+            except Exception:
+                # A bad record must not kill the writer thread: flush()
+                # callers would block forever on the un-drained queue
+                self.logger.exception("Failed to store metrics record")
+            finally:
+                self._queue.task_done()
+
+    def flush(self) -> None:
+        """Block until all queued metrics have been stored."""
+        self._queue.join()
+
+    def _store_metrics(self, metrics: Dict[str, Any]) -> None:
+        """
+        Append metrics to the ring buffer, keeping running aggregates in sync.
+
+        Args:
+            metrics: Metrics record to store
+        """
+        if self.metrics_store.maxlen and len(self.metrics_store) == self.metrics_store.maxlen:
+            evicted = self.metrics_store[0]
+            self._running["count"] -= 1
+            self._running["success"] -= 1 if evicted.get("success") else 0
+            self._running["time_sum"] -= evicted.get("total_processing_time", 0.0)
+            self._running["errors"] -= evicted.get("errors", 0)
+
+        self.metrics_store.append(metrics)
+        self._running["count"] += 1
+        self._running["success"] += 1 if metrics.get("success") else 0
+        self._running["time_sum"] += metrics.get("total_processing_time", 0.0)
+        self._running["errors"] += metrics.get("errors", 0)
+
     def _log_event(self, execution_data: Dict[str, Any], metrics: Dict[str, Any]) -> None:
         """
         Log execution event.
@@ -123,7 +190,7 @@ class MonitoringAgent(BaseAgent):
             metrics: Collected metrics
         """
         event = {
-            "timestamp": datetime.now().isoformat(),
+            "ts_ns": time.monotonic_ns(),
             "event_type": "pipeline_execution",
             "pipeline_id": execution_data.get("pipeline_id"),
             "success": metrics.get("success"),
@@ -193,9 +260,11 @@ class MonitoringAgent(BaseAgent):
         if not anomalies:
             return {"status": "healthy", "details": "All systems operational"}
 
-        critical_count = sum(1 for a in anomalies if a.get("severity") == "critical")
-        error_count = sum(1 for a in anomalies if a.get("severity") == "error")
-        warning_count = sum(1 for a in anomalies if a.get("severity") == "warning")
+        # Single pass over anomalies instead of one scan per severity
+        counts = Counter(a.get("severity") for a in anomalies)
+        critical_count = counts["critical"]
+        error_count = counts["error"]
+        warning_count = counts["warning"]
 
         if critical_count > 0:
             status = "critical"
@@ -214,25 +283,33 @@ class MonitoringAgent(BaseAgent):
             "total_anomalies": len(anomalies)
         }
 
-    def get_metrics_summary(self, last_n: int = 10) -> Dict[str, Any]:
+    def get_metrics_summary(self, last_n: Optional[int] = None) -> Dict[str, Any]:
         """
         Get summary of recent metrics.
 
         Args:
-            last_n: Number of recent metrics to include
+            last_n: Number of recent metrics to include; defaults to the whole
+                ring, which is answered in O(1) from running aggregates
 
         Returns:
             Metrics summary
         """
-        recent_metrics = self.metrics_store[-last_n:]
-
-        if not recent_metrics:
+        self.flush()
+        stored = len(self.metrics_store)
+        if stored == 0:
             return {"message": "No metrics available"}
 
-        total_executions = len(recent_metrics)
-        successful = sum(1 for m in recent_metrics if m.get("success"))
-        avg_time = sum(m.get("total_processing_time", 0) for m in recent_metrics) / total_executions
-        total_errors = sum(m.get("errors", 0) for m in recent_metrics)
+        if last_n is None or last_n >= stored:
+            total_executions = self._running["count"]
+            successful = self._running["success"]
+            avg_time = self._running["time_sum"] / total_executions
+            total_errors = self._running["errors"]
+        else:
+            recent_metrics = list(islice(self.metrics_store, stored - last_n, stored))
+            total_executions = len(recent_metrics)
+            successful = sum(1 for m in recent_metrics if m.get("success"))
+            avg_time = sum(m.get("total_processing_time", 0) for m in recent_metrics) / total_executions
+            total_errors = sum(m.get("errors", 0) for m in recent_metrics)
 
         return {
             "total_executions": total_executions,
@@ -253,7 +330,81 @@ class MonitoringAgent(BaseAgent):
         Returns:
             Exported metrics string
         """
+        self.flush()
         if format == "json":
-            return json.dumps(self.metrics_store, indent=2)
+            records = [self._export_record(m) for m in list(self.metrics_store)]
+            if orjson:
+                return orjson.dumps(
+                    records,
+                    option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS,
+                ).decode()
+            return json.dumps(records, indent=2)
+        elif format == "csv":
+            return self.export_metrics_csv()
         else:
             return "Unsupported format"
+
+    _CSV_HEADERS = ("timestamp", "pipeline_id", "total_processing_time", "success", "errors")
+
+    def export_metrics_csv(self, fp=None) -> Optional[str]:
+        """
+        Export metrics as CSV.
+
+        Args:
+            fp: Optional text file-like object; rows are streamed to it so
+                large exports never materialize one giant string
+
+        Returns:
+            CSV string when no file object is given, otherwise None
+        """
+        self.flush()
+        buf = fp if fp is not None else io.StringIO()
+
+        writer = csv.writer(buf)
+        writer.writerow(self._CSV_HEADERS)
+        writer.writerows(
+            (
+                self._ns_to_iso(m["ts_ns"]) if "ts_ns" in m else m.get("timestamp", ""),
+                m.get("pipeline_id", ""),
+                m.get("total_processing_time", 0.0),
+                m.get("success", False),
+                m.get("errors", 0),
+            )
+            for m in list(self.metrics_store)
+        )
+
+        return buf.getvalue() if fp is None else None
+
+    def _ns_to_iso(self, ns: int) -> str:
+        """Convert a stored monotonic timestamp to an ISO wall-clock string."""
+        return datetime.fromtimestamp(
+            self._t0_wall + (ns - self._t0_mono) / 1e9
+        ).isoformat()
+
+    def _export_record(self, record: Dict[str, Any]) -> Dict[str, Any]:
+        """Materialize an export view of a record with an ISO timestamp."""
+        ts_ns = record.get("ts_ns")
+        if ts_ns is None:
+            return record
+        exported = dict(record)
+        exported["timestamp"] = self._ns_to_iso(exported.pop("ts_ns"))
+        return exported
+
+    def export_metrics_stream(self, fp) -> None:
+        """
+        Stream metrics as NDJSON to a binary file object.
+
+        Writes one record per line so large exports never materialize a
+        single giant string.
+
+        Args:
+            fp: Binary file-like object to write to
+        """
+        self.flush()
+        for metrics in list(self.metrics_store):
+            record = self._export_record(metrics)
+            if orjson:
+                fp.write(orjson.dumps(record, option=orjson.OPT_NON_STR_KEYS))
+            else:
+                fp.write(json.dumps(record).encode("utf-8"))
+            fp.write(b"\n")
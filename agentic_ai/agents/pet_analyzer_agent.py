@@ -6,12 +6,25 @@ Analyzes pet profiles, extracts features, and enriches pet data
 using AI-powered analysis and natural language processing.
 """
 
+import asyncio
 from typing import Dict, Any
 from .base_agent import BaseAgent, AgentState
 from langchain.prompts import ChatPromptTemplate
 from langchain.schema import SystemMessage
+from langchain_core.output_parsers import JsonOutputParser
 import json
-from ..utils.llm import build_chat_llm
+from ..utils.llm import build_chat_llm, build_embeddings
+from ..utils.cache import SemanticResponseCache
+from ..utils.exact_cache import ExactCache
+from ..utils.prompt_trim import trim
+from ..utils.tokens import COUNTER
+
+
+_SYSTEM_TEXT = (
+    "Role: expert pet analyst. Task: analyze pet profile, return JSON "
+    '{"personality_traits":[str],"care_requirements":[str],'
+    '"compatibility_factors":[str],"summary":str}. No prose.'
+)
 
 
 class PetAnalyzerAgent(BaseAgent):
@@ -35,21 +48,39 @@ class PetAnalyzerAgent(BaseAgent):
         # Initialize LangChain LLM
         self.llm = build_chat_llm(config, "pet_analyzer", default_temperature=0.7)
 
-        # Define analysis prompt template
+        # Bound concurrent LLM calls during batch analysis to respect
+        # provider rate limits
+        agent_cfg = config.get("agents", {}).get("pet_analyzer", {})
+        self._sem = asyncio.Semaphore(agent_cfg.get("max_concurrency", 16))
+
+        # Shelter pets are re-analyzed constantly: cache parsed analyses by
+        # exact prompt hash and embedding similarity
+        self.analysis_cache = SemanticResponseCache(agent_cfg.get("analysis_cache", {}))
+        self._embeddings_model = None
+
+        # Durable exact tier: analyses keyed by content hash survive restarts
+        self.exact_cache = ExactCache(agent_cfg.get("exact_cache", {}))
+
+        # Define analysis prompt template. Telegraphic form: billed on every
+        # call, so the system message carries only the role and schema.
         self.analysis_prompt = ChatPromptTemplate.from_messages([
-            SystemMessage(content="""You are an expert pet analyst. Analyze pet profiles
-            and extract key features including personality traits, care requirements,
-            compatibility factors, and behavioral characteristics. Return structured JSON.
-
-            Required JSON keys:
-            - personality_traits (list of strings)
-            - care_requirements (list of strings)
-            - compatibility_factors (list of strings)
-            - summary (string)
-            """),
+            SystemMessage(content=_SYSTEM_TEXT),
             ("human", "Analyze this pet profile:\n{pet_data}")
         ])
 
+        # The system prompt is static: count its tokens once, then derive
+        # the per-request budget for the dynamic tail from whatever the
+        # input window leaves after the prompt and a safety margin
+        self._sys_tokens = COUNTER.count(_SYSTEM_TEXT)
+        max_input = agent_cfg.get("max_input_tokens", 1024)
+        self._trim_budget = max(64, max_input - self._sys_tokens - 256)
+
+        # One LCEL runnable built at init: prompt formatting and the LLM call
+        # run inside LangChain instead of per-call Python; the parser is kept
+        # separate so parse failures can fall back to the raw text
+        self.analysis_chain = self.analysis_prompt | self.llm
+        self._json_parser = JsonOutputParser()
+
     async def process(self, state: AgentState) -> AgentState:
         """
         Process pet data through AI analysis.
@@ -97,16 +128,33 @@ class PetAnalyzerAgent(BaseAgent):
         Returns:
             Analysis results dictionary
         """
-        # Format the prompt
-        messages = self.analysis_prompt.format_messages(pet_data=pet_description)
-
-        # Get LLM response
-        response = await self.llm.apredict_messages(messages)
+        # Durable exact-tier lookup first: identical pet content skips
+        # everything, even across restarts
+        content_key = ExactCache.content_key(pet_description)
+        durable = self.exact_cache.get(content_key)
+        if durable is not None:
+            return durable
+
+        # Two-tier cache lookup before paying for an LLM round-trip
+        cache_key = SemanticResponseCache.make_key(pet_description)
+        cached = self.analysis_cache.get_exact(cache_key)
+        if cached is not None:
+            return cached
+
+        embedding = await self._embed_prompt(pet_description)
+        if embedding is not None:
+            similar = self.analysis_cache.find_similar(embedding)
+            if similar is not None:
+                return similar
+
+        # Run the precompiled chain
+        async with self._sem:
+            response = await self.analysis_chain.ainvoke({"pet_data": pet_description})
 
         # Parse the response
         try:
-            analysis = json.loads(response.content)
-        except json.JSONDecodeError:
+            analysis = self._json_parser.parse(response.content)
+        except Exception:
             # Fallback to raw text if JSON parsing fails
             analysis = {
                 "raw_analysis": response.content,
@@ -115,8 +163,29 @@ class PetAnalyzerAgent(BaseAgent):
                 "compatibility_factors": []
             }
 
+        self.analysis_cache.put(cache_key, analysis, embedding)
+        self.exact_cache.put(content_key, analysis)
+
         return analysis
 
+    async def _embed_prompt(self, text: str):
+        """
+        Embed a formatted prompt for the semantic cache tier.
+
+        Returns None when the cache is disabled or embeddings are unavailable,
+        in which case only the exact tier is used.
+        """
+        if not self.analysis_cache.enabled:
+            return None
+
+        try:
+            if self._embeddings_model is None:
+                self._embeddings_model = build_embeddings(self.config)
+            return await self._embeddings_model.aembed_query(text)
+        except Exception as e:  # pragma: no cover - depends on provider availability
+            self.logger.debug(f"Semantic cache embedding unavailable: {str(e)}")
+            return None
+
     def _format_pet_data(self, pet_data: Dict[str, Any]) -> str:
         """
         Format pet data for LLM analysis.
@@ -127,12 +196,21 @@ class PetAnalyzerAgent(BaseAgent):
         Returns:
             Formatted string representation
         """
+        # Metadata is arbitrary and can balloon the prompt: trim it to a
+        # token budget and serialize compactly (no indent whitespace)
+        metadata = json.dumps(
+            trim(pet_data.get("metadata", {}), self._trim_budget, COUNTER.count),
+            separators=(",", ":"),
+            default=str,
+        )
+        description = pet_data.get("description", "No description available")[:500]
+
         return f"""
         Name: {pet_data.get('name', 'Unknown')}
         Type: {pet_data.get('type', 'Unknown')}
-        Description: {pet_data.get('description', 'No description available')}
+        Description: {description}
         Shelter: {pet_data.get('shelterName', 'Unknown')}
-        Additional Info: {json.dumps(pet_data.get('metadata', {}), indent=2)}
+        Additional Info: {metadata}
         """
 
     async def batch_analyze(self, pets: list[Dict[str, Any]]) -> list[Dict[str, Any]]:
@@ -145,18 +223,19 @@ class PetAnalyzerAgent(BaseAgent):
         Returns:
             List of analysis results
         """
-        results = []
-
-        for pet in pets:
-            state = AgentState(
+        states = [
+            AgentState(
                 agent_name=self.name,
                 timestamp=None,
                 data={"pet": pet},
                 metadata={},
                 errors=[]
             )
+            for pet in pets
+        ]
 
-            analyzed_state = await self.process(state)
-            results.append(analyzed_state.data)
+        # Fan out concurrently: N pets cost ~1 round-trip instead of N,
+        # bounded by the semaphore inside _analyze_pet
+        analyzed_states = await asyncio.gather(*(self.process(s) for s in states))
 
-        return results
+        return [s.data for s in analyzed_states]
@@ -6,12 +6,19 @@ Generates personalized pet recommendations using advanced AI algorithms,
 collaborative filtering, and content-based filtering techniques.
 """
 
+from collections import defaultdict
 from typing import Dict, Any, List
 from .base_agent import BaseAgent, AgentState
 from langchain.prompts import ChatPromptTemplate
+from langchain_core.output_parsers import JsonOutputParser
 import json
 from ..utils.llm import build_chat_llm
 
+try:
+    import orjson
+except Exception:  # pragma: no cover - optional dependency
+    orjson = None
+
 
 class RecommendationAgent(BaseAgent):
     """
@@ -33,16 +40,28 @@ class RecommendationAgent(BaseAgent):
 
         self.llm = build_chat_llm(config, "recommendation", default_temperature=0.8)
 
+        # Telegraphic system prompt: billed on every call, so it carries only
+        # the role, ranking criteria, and schema
         self.recommendation_prompt = ChatPromptTemplate.from_messages([
-            ("system", """You are a pet recommendation expert. Generate personalized
-            recommendations with detailed explanations. Consider user preferences,
-            personality, lifestyle, and match scores. Return structured JSON with:
-            { "recommendations": [ { "pet": {...}, "score": float, "reasons": [string] } ] }"""),
-            ("human", "Generate recommendations for:\nUser: {user_data}\nMatches: {matches}")
+            ("system", (
+                "Role: pet recommendation expert. Task: rank by user preferences, "
+                "personality, lifestyle, match scores. Return JSON "
+                '{{"recommendations":[{{"pet":obj,"score":float,"reasons":[str]}}]}}. No prose.'
+            )),
+            # Static instruction turn stays byte-identical across requests so
+            # provider prefix caching covers everything before the dynamic tail
+            ("human", "Generate recommendations for the user and matches that follow."),
+            ("human", "User: {user_data}\nMatches: {matches}")
         ])
 
         self.diversity_factor = config.get("diversity_factor", 0.3)
 
+        # One LCEL runnable built at init: prompt formatting and the LLM call
+        # run inside LangChain instead of per-call Python; the parser is kept
+        # separate so parse failures can fall back to the raw matches
+        self.recommendation_chain = self.recommendation_prompt | self.llm
+        self._json_parser = JsonOutputParser()
+
     async def process(self, state: AgentState) -> AgentState:
         """
         Process matches to generate personalized recommendations.
@@ -120,19 +139,26 @@ class RecommendationAgent(BaseAgent):
             for m in matches[:10]  # Top 10 matches
         ]
 
-        messages = self.recommendation_prompt.format_messages(
-            user_data=json.dumps(user_summary, indent=2),
-            matches=json.dumps(match_summary, indent=2)
-        )
+        # Compact serialization (no indent whitespace): faster to encode
+        # and fewer prompt tokens
+        if orjson:
+            user_data = orjson.dumps(user_summary).decode()
+            match_data = orjson.dumps(match_summary).decode()
+        else:
+            user_data = json.dumps(user_summary, separators=(",", ":"))
+            match_data = json.dumps(match_summary, separators=(",", ":"))
 
-        response = await self.llm.apredict_messages(messages)
+        response = await self.recommendation_chain.ainvoke({
+            "user_data": user_data,
+            "matches": match_data,
+        })
 
         # Parse recommendations
         try:
-            recommendations = json.loads(response.content)
+            recommendations = self._json_parser.parse(response.content)
             if isinstance(recommendations, dict):
                 recommendations = recommendations.get("recommendations", [])
-        except json.JSONDecodeError:
+        except Exception:
             # Fallback to matches if parsing fails
             recommendations = matches
 
@@ -145,6 +171,10 @@ class RecommendationAgent(BaseAgent):
         """
         Diversify recommendations to avoid echo chamber effect.
 
+        Buckets recommendations by pet type (score-sorted) and interleaves
+        the buckets round-robin, so no type dominates the head of the list.
+        Single pass after one sort — no quadratic membership scans.
+
         Args:
             recommendations: List of recommendations
 
@@ -154,22 +184,23 @@ class RecommendationAgent(BaseAgent):
         if not recommendations:
             return []
 
-        diversified = []
-        seen_types = set()
+        buckets: Dict[str, List[Dict[str, Any]]] = defaultdict(list)
+        for rec in sorted(
+            recommendations, key=lambda r: r.get("score", 0), reverse=True
+        ):
+            buckets[rec.get("pet", {}).get("type", "Unknown")].append(rec)
 
-        # First pass: add diverse types
-        for rec in recommendations:
-            pet_type = rec.get("pet", {}).get("type", "Unknown")
-
-            if pet_type not in seen_types or len(diversified) >= len(recommendations) * 0.7:
-                diversified.append(rec)
-                seen_types.add(pet_type)
-
-        # Second pass: fill remaining slots with highest scores
-        remaining = [r for r in recommendations if r not in diversified]
-        remaining_sorted = sorted(remaining, key=lambda x: x.get("score", 0), reverse=True)
-
-        diversified.extend(remaining_sorted[:max(0, len(recommendations) - len(diversified))])
+        # Round-robin across type buckets until every slot is filled
+        diversified = []
+        queues = [iter(bucket) for bucket in buckets.values()]
+        while queues:
+            still_open = []
+            for queue in queues:
+                rec = next(queue, None)
+                if rec is not None:
+                    diversified.append(rec)
+                    still_open.append(queue)
+            queues = still_open
 
         return diversified
 
@@ -202,7 +233,7 @@ class RecommendationAgent(BaseAgent):
                 "match_reasons": rec.get("reasons", []),
                 "recommendation_strength": self._get_strength_label(score),
                 "why_recommended": self._generate_why_text(user_profile, pet, score),
-                "pet_highlights": pet.get("pet_analysis", {}).get("personality_traits", [])[:3]
+                "pet_highlights": (pet.get("pet_analysis") or {}).get("personality_traits", [])[:3]
             }
 
             explained.append(explanation)
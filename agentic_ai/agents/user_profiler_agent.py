@@ -11,7 +11,18 @@ from .base_agent import BaseAgent, AgentState
 from langchain.prompts import ChatPromptTemplate
 import numpy as np
 import json
-from ..utils.llm import build_chat_llm
+from ..utils.llm import build_chat_llm, build_embeddings
+from ..utils.cache import SemanticResponseCache
+from ..utils.prompt_trim import trim
+from ..utils.tokens import COUNTER
+
+
+_SYSTEM_TEXT = (
+    "Task: build user profile from swipe patterns, liked pets, "
+    "activity times, interaction frequency. The user data follows in the "
+    "next message. Return JSON "
+    '{"pet_types":[str],"lifestyle":[str],"notes":str}. No prose.'
+)
 
 
 class UserProfilerAgent(BaseAgent):
@@ -34,14 +45,32 @@ class UserProfilerAgent(BaseAgent):
 
         self.llm = build_chat_llm(config, "user_profiler", default_temperature=0.5)
 
+        # User bios and swipe stats repeat across sessions: cache built
+        # preferences by exact prompt hash and embedding similarity
+        agent_cfg = config.get("agents", {}).get("user_profiler", {})
+        self.preferences_cache = SemanticResponseCache(agent_cfg.get("preferences_cache", {}))
+        self._embeddings_model = None
+
+        # Below this many swipes the LLM has nothing to add: skip the call
+        # and build the profile deterministically (the cold-start fast path)
+        self.min_swipes_for_llm = agent_cfg.get("min_swipes_for_llm", 5)
+
+        # Telegraphic system prompt: billed on every call, so it carries only
+        # the task, signals, and schema
         self.profile_prompt = ChatPromptTemplate.from_messages([
-            ("system", """Analyze user behavior and preferences to build a comprehensive profile.
-            Consider swipe patterns, liked pets, time of day activity, and interaction frequency.
-            Return structured JSON with:
-            { "pet_types": [string], "lifestyle": [string], "notes": string }"""),
-            ("human", "User data:\n{user_data}")
+            # Double the JSON braces so the template engine leaves them alone
+            ("system", _SYSTEM_TEXT.replace("{", "{{").replace("}", "}}")),
+            # Dynamic data strictly last so the static prefix stays cacheable
+            ("human", "{user_data}")
         ])
 
+        # The system prompt is static: count its tokens once, then derive
+        # the per-request budget for the dynamic tail from whatever the
+        # input window leaves after the prompt and a safety margin
+        self._sys_tokens = COUNTER.count(_SYSTEM_TEXT)
+        max_input = agent_cfg.get("max_input_tokens", 1024)
+        self._trim_budget = max(64, max_input - self._sys_tokens - 256)
+
     async def process(self, state: AgentState) -> AgentState:
         """
         Process user data to build a comprehensive profile.
@@ -106,18 +135,28 @@ class UserProfilerAgent(BaseAgent):
                 "patterns": {}
             }
 
+        # Struct-of-arrays: one C-level pass instead of Python loops over
+        # potentially thousands of swipes
         total_swipes = len(swipe_history)
-        likes = sum(1 for swipe in swipe_history if swipe.get("liked"))
-        like_ratio = likes / total_swipes if total_swipes > 0 else 0
+        liked = np.fromiter(
+            (bool(s.get("liked")) for s in swipe_history),
+            dtype=bool,
+            count=total_swipes,
+        )
+        types = np.array(
+            [s.get("pet", {}).get("type", "Unknown") for s in swipe_history],
+            dtype=object,
+        )
 
-        # Analyze preferred pet types
-        pet_types = {}
-        for swipe in swipe_history:
-            if swipe.get("liked"):
-                pet_type = swipe.get("pet", {}).get("type", "Unknown")
-                pet_types[pet_type] = pet_types.get(pet_type, 0) + 1
+        likes = int(liked.sum())
+        like_ratio = likes / total_swipes if total_swipes > 0 else 0
 
-        preferred_types = sorted(pet_types.items(), key=lambda x: x[1], reverse=True)
+        # Liked-type distribution in one unique+count kernel call
+        unique_types, counts = np.unique(types[liked], return_counts=True)
+        order = np.argsort(-counts)
+        preferred_types = [
+            (unique_types[i], int(counts[i])) for i in order
+        ]
 
         return {
             "total_swipes": total_swipes,
@@ -146,13 +185,44 @@ class UserProfilerAgent(BaseAgent):
         Returns:
             User preferences dictionary
         """
+        # Cold start: nearly-empty histories gain nothing from the LLM
+        if swipe_analysis.get("total_swipes", 0) < self.min_swipes_for_llm:
+            return {
+                "pet_types": swipe_analysis.get("preferred_types", []),
+                "user_behavior": swipe_analysis.get("patterns", {}),
+                "like_ratio": swipe_analysis.get("like_ratio", 0.0),
+                "lifestyle": [],
+                "notes": "",
+                "ai_insights": "",
+            }
+
+        # type_distribution can be huge: trim the analysis to a token budget
+        # and serialize compactly before it enters the prompt
+        trimmed_analysis = json.dumps(
+            trim(swipe_analysis, self._trim_budget, COUNTER.count),
+            separators=(",", ":"),
+            default=str,
+        )
+
         formatted_data = f"""
         User ID: {user_data.get('id')}
-        Bio: {user_data.get('bio', 'No bio')}
+        Bio: {user_data.get('bio', 'No bio')[:500]}
         Age: {user_data.get('age', 'Unknown')}
-        Swipe Analysis: {swipe_analysis}
+        Swipe Analysis: {trimmed_analysis}
         """
 
+        # Two-tier cache lookup before paying for an LLM round-trip
+        cache_key = SemanticResponseCache.make_key(formatted_data)
+        cached = self.preferences_cache.get_exact(cache_key)
+        if cached is not None:
+            return cached
+
+        embedding = await self._embed_prompt(formatted_data)
+        if embedding is not None:
+            similar = self.preferences_cache.find_similar(embedding)
+            if similar is not None:
+                return similar
+
         messages = self.profile_prompt.format_messages(user_data=formatted_data)
         response = await self.llm.apredict_messages(messages)
 
@@ -172,8 +242,28 @@ class UserProfilerAgent(BaseAgent):
             "ai_insights": ai_insights,
         }
 
+        self.preferences_cache.put(cache_key, preferences, embedding)
+
         return preferences
 
+    async def _embed_prompt(self, text: str):
+        """
+        Embed a formatted prompt for the semantic cache tier.
+
+        Returns None when the cache is disabled or embeddings are unavailable,
+        in which case only the exact tier is used.
+        """
+        if not self.preferences_cache.enabled:
+            return None
+
+        try:
+            if self._embeddings_model is None:
+                self._embeddings_model = build_embeddings(self.config)
+            return await self._embeddings_model.aembed_query(text)
+        except Exception as e:  # pragma: no cover - depends on provider availability
+            self.logger.debug(f"Semantic cache embedding unavailable: {str(e)}")
+            return None
+
     def _generate_embeddings(self, preferences: Dict[str, Any]) -> np.ndarray:
         """
         Generate user embeddings for similarity matching.
@@ -184,14 +274,36 @@ class UserProfilerAgent(BaseAgent):
         Returns:
             NumPy array of embeddings
         """
+        return self.generate_embeddings_batch([preferences])[0]
+
+    def generate_embeddings_batch(
+        self,
+        preferences_list: List[Dict[str, Any]]
+    ) -> np.ndarray:
+        """
+        Generate embeddings for many users in one vectorized pass.
+
+        Args:
+            preferences_list: List of preference dictionaries
+
+        Returns:
+            Contiguous (N, 5) float32 array, one row per user
+        """
         # Simplified embedding generation
         # In production, use proper embedding models
-        features = [
-            preferences.get("like_ratio", 0.0),
-            len(preferences.get("pet_types", [])),
-            1.0 if preferences.get("user_behavior", {}).get("selective") else 0.0,
-            1.0 if preferences.get("user_behavior", {}).get("open") else 0.0,
-            1.0 if preferences.get("user_behavior", {}).get("balanced") else 0.0
+        out = np.zeros((len(preferences_list), 5), dtype=np.float32)
+        out[:, 0] = [p.get("like_ratio", 0.0) for p in preferences_list]
+        out[:, 1] = [len(p.get("pet_types", [])) for p in preferences_list]
+        out[:, 2] = [
+            1.0 if p.get("user_behavior", {}).get("selective") else 0.0
+            for p in preferences_list
         ]
-
-        return np.array(features, dtype=np.float32)
+        out[:, 3] = [
+            1.0 if p.get("user_behavior", {}).get("open") else 0.0
+            for p in preferences_list
+        ]
+        out[:, 4] = [
+            1.0 if p.get("user_behavior", {}).get("balanced") else 0.0
+            for p in preferences_list
+        ]
+        return out
@@ -1,14 +1,25 @@
 """FastAPI application for Agentic AI."""
 
+import hashlib
+import json
 import time
 import uuid
+from typing import List
+from contextlib import asynccontextmanager
 from typing import Any, Dict
 
 from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse, Response
+from fastapi.responses import JSONResponse, Response, StreamingResponse
 from prometheus_client import CONTENT_TYPE_LATEST, generate_latest
 
+try:
+    import orjson
+    from fastapi.responses import ORJSONResponse
+except Exception:  # pragma: no cover - optional dependency
+    orjson = None
+    ORJSONResponse = None
+
 from ..service.engine import AgenticEngine
 from ..utils.config import load_config
 from ..utils.logger import setup_logging
@@ -29,22 +40,49 @@ from .schemas import (
 )
 
 
+# Config is loaded at import for middleware wiring (load_config caches);
+# heavy construction happens once per worker in the lifespan below
 config = load_config()
-setup_logging(config.get("logging", {}).get("level", "INFO"), config.get("logging"))
-
-app = FastAPI(title="PetSwipe Agentic AI", version="1.0.0")
-engine = AgenticEngine(config)
-
-security_cfg = config.get("security", {})
-api_key_auth = APIKeyAuth(security_cfg)
-rate_cfg = security_cfg.get("rate_limiting", {})
-rate_limiter = (
-    RateLimiter(rate_cfg.get("requests_per_minute", 120))
-    if rate_cfg.get("enabled", True)
-    else None
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Build the engine and security helpers once per worker."""
+    setup_logging(config.get("logging", {}).get("level", "INFO"), config.get("logging"))
+
+    security_cfg = config.get("security", {})
+    rate_cfg = security_cfg.get("rate_limiting", {})
+
+    app.state.config = config
+    app.state.engine = AgenticEngine(config)
+    app.state.api_key_auth = APIKeyAuth(security_cfg)
+    app.state.rate_limiter = (
+        RateLimiter(
+            rate_cfg.get("requests_per_minute", 120),
+            redis_url=rate_cfg.get("redis_url") or config.get("cache", {}).get("redis_url"),
+        )
+        if rate_cfg.get("enabled", True)
+        else None
+    )
+
+    if config.get("server", {}).get("prewarm_workflows", False):
+        await app.state.engine.prewarm()
+
+    try:
+        yield
+    finally:
+        await app.state.engine.close()
+
+
+app = FastAPI(
+    title="PetSwipe Agentic AI",
+    version="1.0.0",
+    lifespan=lifespan,
+    # orjson serializes responses in C; fall back to stdlib json if absent
+    default_response_class=ORJSONResponse if ORJSONResponse else JSONResponse,
 )
 
-cors_cfg = security_cfg.get("cors", {})
+cors_cfg = config.get("security", {}).get("cors", {})
 if cors_cfg.get("enabled", True):
     app.add_middleware(
         CORSMiddleware,
@@ -55,15 +93,28 @@ if cors_cfg.get("enabled", True):
     )
 
 
+#: Paths exempt from auth/rate limiting, frozen at import
+_SKIP_PATHS = frozenset({"/health", "/metrics"})
+
+
 @app.middleware("http")
 async def auth_and_rate_limit(request: Request, call_next):
-    if request.url.path in {"/health", "/metrics"}:
+    # Read the raw ASGI scope: skips Starlette's URL parse and header-dict
+    # allocation on the hot path
+    if request.scope["path"] in _SKIP_PATHS:
         return await call_next(request)
 
-    supplied_key = request.headers.get(api_key_auth.header)
+    api_key_auth = request.app.state.api_key_auth
+    supplied_key = None
+    header_name = api_key_auth.header_bytes
+    for name, value in request.scope["headers"]:
+        if name == header_name:
+            supplied_key = value.decode("latin-1")
+            break
     if not api_key_auth.validate(supplied_key):
         return JSONResponse(status_code=401, content={"message": "Unauthorized"})
 
+    rate_limiter = request.app.state.rate_limiter
     if rate_limiter:
         client_ip = request.client.host if request.client else "unknown"
         allowed = await rate_limiter.allow(client_ip)
@@ -72,24 +123,21 @@ async def auth_and_rate_limit(request: Request, call_next):
 
     request_id = request.headers.get("X-Request-Id", str(uuid.uuid4()))
     request.state.request_id = request_id
-    start = time.monotonic()
+    # Integer nanosecond timing and raw header append: no float math or
+    # f-string formatting on the per-request path
+    start = time.perf_counter_ns()
     response = await call_next(request)
-    duration = time.monotonic() - start
+    duration_us = (time.perf_counter_ns() - start) // 1000
     response.headers["X-Request-Id"] = request_id
-    response.headers["X-Response-Time"] = f"{duration:.4f}s"
+    response.raw_headers.append((b"x-response-time-us", str(duration_us).encode()))
     return response
 
 
-@app.on_event("shutdown")
-async def shutdown_event():
-    await engine.close()
-
-
 @app.get("/health")
-async def health() -> Dict[str, Any]:
+async def health(request: Request) -> Dict[str, Any]:
     return {
         "status": "healthy",
-        "workflows": engine.list_workflows(),
+        "workflows": request.app.state.engine.list_workflows(),
     }
 
 
@@ -98,50 +146,90 @@ async def metrics() -> Response:
     return Response(generate_latest(), media_type=CONTENT_TYPE_LATEST)
 
 
+#: Hard cap on candidates per request; duplicates balloon downstream tokens
+_MAX_CANDIDATES = config.get("server", {}).get("max_candidates", 200)
+
+
+def _dedup_candidates(pets: List[Dict[str, Any]], limit: int = _MAX_CANDIDATES) -> List[Dict[str, Any]]:
+    """Drop duplicate pet candidates (by id, else content hash) and cap the list."""
+    seen = set()
+    out = []
+    for pet in pets:
+        key = pet.get("id")
+        if not key:
+            raw = json.dumps(pet, sort_keys=True, default=str, separators=(",", ":"))
+            key = hashlib.blake2s(raw.encode("utf-8")).digest()
+        if key in seen:
+            continue
+        seen.add(key)
+        out.append(pet)
+        if len(out) >= limit:
+            break
+    return out
+
+
 @app.post("/v1/analysis/pet", response_model=PetAnalysisResponse)
-async def analyze_pet(payload: PetAnalysisRequest):
-    return await engine.analyze_pet(payload.pet.model_dump())
+async def analyze_pet(payload: PetAnalysisRequest, request: Request):
+    return await request.app.state.engine.analyze_pet(payload.pet.model_dump())
 
 
 @app.post("/v1/profile", response_model=ProfileResponse)
-async def profile_user(payload: ProfileRequest):
-    return await engine.profile_user(
-        payload.user.model_dump(),
-        [s.model_dump() for s in payload.swipe_history],
-    )
+async def profile_user(payload: ProfileRequest, request: Request):
+    # One Rust-side walk of the whole payload instead of N model_dump calls
+    data = payload.model_dump(mode="python")
+    return await request.app.state.engine.profile_user(data["user"], data["swipe_history"])
 
 
 @app.post("/v1/match", response_model=MatchResponse)
-async def match_pets(payload: MatchRequest):
-    return await engine.match_pets(
-        payload.user.model_dump(),
-        [s.model_dump() for s in payload.swipe_history],
-        [p.model_dump() for p in payload.pet_candidates],
+async def match_pets(payload: MatchRequest, request: Request):
+    data = payload.model_dump(mode="python")
+    return await request.app.state.engine.match_pets(
+        data["user"],
+        data["swipe_history"],
+        _dedup_candidates(data["pet_candidates"]),
     )
 
 
 @app.post("/v1/recommendations", response_model=RecommendationResponse)
-async def recommend(payload: RecommendationRequest):
-    return await engine.recommend(
-        payload.user.model_dump(),
-        [s.model_dump() for s in payload.swipe_history],
-        [p.model_dump() for p in payload.pet_candidates],
+async def recommend(payload: RecommendationRequest, request: Request):
+    data = payload.model_dump(mode="python")
+    return await request.app.state.engine.recommend(
+        data["user"],
+        data["swipe_history"],
+        _dedup_candidates(data["pet_candidates"]),
     )
 
 
 @app.post("/v1/chat", response_model=ChatResponse)
-async def chat(payload: ChatRequest):
-    return await engine.chat(payload.message, payload.context)
+async def chat(payload: ChatRequest, request: Request):
+    return await request.app.state.engine.chat(payload.message, payload.context)
+
+
+@app.post("/v1/chat/stream")
+async def chat_stream(payload: ChatRequest, request: Request):
+    """Stream chat tokens over SSE instead of awaiting the full completion."""
+    engine = request.app.state.engine
+
+    def _event(obj: Dict[str, Any]) -> str:
+        data = orjson.dumps(obj).decode() if orjson else json.dumps(obj)
+        return f"data: {data}\n\n"
+
+    async def event_stream():
+        async for token in engine.chat_stream(payload.message, payload.context):
+            yield _event({"type": "token", "text": token})
+        yield _event({"type": "done"})
+
+    return StreamingResponse(event_stream(), media_type="text/event-stream")
 
 
 @app.get("/v1/costs/summary", response_model=CostSummaryResponse)
-async def cost_summary(since_minutes: int | None = None):
-    return engine.cost_tracker.summary(since_minutes=since_minutes)
+async def cost_summary(request: Request, since_minutes: int | None = None):
+    return request.app.state.engine.cost_tracker.summary(since_minutes=since_minutes)
 
 
 @app.get("/v1/costs/recent", response_model=CostEntriesResponse)
-async def cost_recent(limit: int = 100):
-    return {"entries": engine.cost_tracker.recent(limit=limit)}
+async def cost_recent(request: Request, limit: int = 100):
+    return {"entries": request.app.state.engine.cost_tracker.recent(limit=limit)}
 
 
 @app.get("/v1/mcp/info")
@@ -170,9 +258,9 @@ async def mcp_info() -> Dict[str, Any]:
 
 
 @app.get("/v1/mcp/health")
-async def mcp_health() -> Any:
+async def mcp_health(request: Request) -> Any:
     """Probe MCP client connectivity to the configured standalone MCP server."""
-    result = await engine.check_mcp_connectivity()
+    result = await request.app.state.engine.check_mcp_connectivity()
     if result.get("status") == "unhealthy":
         return JSONResponse(status_code=503, content=result)
     return result
@@ -5,17 +5,20 @@ from pydantic import BaseModel, ConfigDict, Field
 
 
 class PetProfile(BaseModel):
-    model_config = ConfigDict(extra="allow")
+    model_config = ConfigDict(extra="ignore", frozen=True)
     id: Optional[str] = None
     name: Optional[str] = None
     type: Optional[str] = None
     description: Optional[str] = None
     shelterName: Optional[str] = None
     metadata: Dict[str, Any] = Field(default_factory=dict)
+    # Enrichment from a prior /v1/analysis/pet call; consumed by the
+    # matching and recommendation agents
+    pet_analysis: Optional[Dict[str, Any]] = None
 
 
 class UserProfile(BaseModel):
-    model_config = ConfigDict(extra="allow")
+    model_config = ConfigDict(extra="ignore", frozen=True)
     id: Optional[str] = None
     email: Optional[str] = None
     name: Optional[str] = None
@@ -24,7 +27,7 @@ class UserProfile(BaseModel):
 
 
 class SwipeRecord(BaseModel):
-    model_config = ConfigDict(extra="allow")
+    model_config = ConfigDict(extra="ignore", frozen=True)
     liked: bool
     pet: PetProfile
 
@@ -1,5 +1,7 @@
 """Uvicorn entrypoint for Agentic AI API."""
 
+import os
+
 import uvicorn
 
 from ..utils.config import load_config
@@ -10,13 +12,34 @@ def main() -> None:
     server_cfg = config.get("server", {})
     host = server_cfg.get("host", "0.0.0.0")
     port = server_cfg.get("port", 8765)
-    workers = server_cfg.get("workers", 1)
+    # Default to multiple workers for this I/O-bound gateway unless the
+    # config pins a count
+    workers = server_cfg.get("workers") or max(2, os.cpu_count() or 1)
+
+    # Prefer the C-backed event loop and HTTP parser when installed
+    loop = "auto"
+    http = "auto"
+    try:
+        import uvloop  # noqa: F401
+
+        loop = "uvloop"
+    except ImportError:  # pragma: no cover - optional dependency
+        pass
+    try:
+        import httptools  # noqa: F401
+
+        http = "httptools"
+    except ImportError:  # pragma: no cover - optional dependency
+        pass
 
     uvicorn.run(
         "agentic_ai.api.app:app",
         host=host,
         port=port,
         workers=workers,
+        loop=loop,
+        http=http,
+        backlog=server_cfg.get("backlog", 2048),
         log_level="info",
     )
 
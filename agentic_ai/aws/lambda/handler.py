@@ -5,11 +5,51 @@ AWS Lambda Handler
 Lambda function handler for serverless deployment of the Agentic AI pipeline.
 """
 
+import asyncio
 import json
 import os
 import logging
 from typing import Dict, Any
 
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None
+
+if orjson:
+    def _dumps(obj: Any) -> str:
+        return orjson.dumps(obj).decode()
+
+    _loads = orjson.loads
+else:
+    def _dumps(obj: Any) -> str:
+        return json.dumps(obj)
+
+    _loads = json.loads
+
+
+def _encode_envelope(success: bool, data: Any, metadata: Any, errors: Any) -> str:
+    """Serialize the fixed-shape Lambda response envelope.
+
+    The outer structure never varies, so only the inner values pass through
+    the JSON encoder; the envelope itself is byte-template concatenation.
+    """
+    if orjson is None:
+        return _dumps({
+            "success": success,
+            "data": data,
+            "metadata": metadata,
+            "errors": errors
+        })
+
+    return b"".join((
+        b'{"success":', b"true" if success else b"false",
+        b',"data":', orjson.dumps(data),
+        b',"metadata":', orjson.dumps(metadata),
+        b',"errors":', orjson.dumps(errors),
+        b"}",
+    )).decode()
+
 # Import agentic AI components
 import sys
 sys.path.append("/opt/python")
@@ -22,6 +62,32 @@ from agentic_ai.workflows import WorkflowBuilder
 logger = logging.getLogger()
 logger.setLevel(logging.INFO)
 
+# Static response pieces, built once at cold start
+_CORS_HEADERS = {
+    "Content-Type": "application/json",
+    "Access-Control-Allow-Origin": "*"
+}
+_JSON_HEADERS = {"Content-Type": "application/json"}
+_INVALID_WORKFLOW_BODY_PREFIX = '{"error":"INVALID_WORKFLOW","message":'
+
+
+def _invalid_workflow_body(workflow_type: Any) -> str:
+    """Build the invalid-workflow error body.
+
+    The workflow name is client-controlled, so it goes through the JSON
+    encoder rather than raw string interpolation.
+    """
+    return (
+        _INVALID_WORKFLOW_BODY_PREFIX
+        + json.dumps(f"Unknown workflow: {workflow_type}")
+        + "}"
+    )
+
+# One event loop for the container lifetime: warm invocations skip loop
+# construction/teardown entirely. Handlers must not leave pending tasks.
+_LOOP = asyncio.new_event_loop()
+asyncio.set_event_loop(_LOOP)
+
 # Initialize workflows (cold start)
 config = load_config()
 
@@ -39,11 +105,43 @@ if min_score_override:
         "min_score_threshold"
     ] = float(min_score_override)
 
-workflows = {
-    "recommendation": WorkflowBuilder.build_recommendation_workflow(config),
-    "conversation": WorkflowBuilder.build_conversation_workflow(config),
-    "analysis": WorkflowBuilder.build_analysis_workflow(config)
+# Workflows are built lazily per type: a container that only ever serves
+# one workflow never pays construction cost for the other two
+_workflow_builders = {
+    "recommendation": WorkflowBuilder.build_recommendation_workflow,
+    "conversation": WorkflowBuilder.build_conversation_workflow,
+    "analysis": WorkflowBuilder.build_analysis_workflow
 }
+_workflows: Dict[str, Any] = {}
+
+
+# Frozen view of valid workflow names for the per-request membership test
+_VALID_WORKFLOWS = frozenset(_workflow_builders)
+
+# Static part of the health envelope, allocated once
+_HEALTH_STATIC = {
+    "status": "healthy",
+    "workflows": list(_workflow_builders.keys())
+}
+
+
+def _get_workflow(workflow_type: str) -> Any:
+    """Build (once) and return the workflow for a type."""
+    workflow = _workflows.get(workflow_type)
+    if workflow is None:
+        workflow = _workflow_builders[workflow_type](config)
+        _workflows[workflow_type] = workflow
+    return workflow
+
+
+# Warm init: exercise the serializer while init-phase CPU is free, and
+# pre-build any workflows named in WARM_WORKFLOWS (comma-separated) so
+# provisioned-concurrency containers take their first request warm
+_loads(_dumps({"success": True, "data": {}, "metadata": {}, "errors": []}))
+for _name in os.environ.get("WARM_WORKFLOWS", "").split(","):
+    _name = _name.strip()
+    if _name in _workflow_builders:
+        _get_workflow(_name)
 
 
 def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
@@ -58,58 +156,51 @@ def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
         Response dictionary
     """
     try:
-        logger.info(f"Processing request: {event.get('requestContext', {}).get('requestId')}")
+        # Deferred %-formatting: skip the dict walk and string build entirely
+        # when INFO is not emitted
+        if logger.isEnabledFor(logging.INFO):
+            logger.info(
+                "Processing request: %s",
+                event.get("requestContext", {}).get("requestId"),
+            )
 
         # Parse request body
-        body = json.loads(event.get("body", "{}"))
+        body = _loads(event.get("body", "{}"))
 
         workflow_type = body.get("workflow", "recommendation")
         input_data = body.get("data", {})
 
         # Validate workflow type
-        if workflow_type not in workflows:
+        if workflow_type not in _VALID_WORKFLOWS:
             return {
                 "statusCode": 400,
-                "headers": {
-                    "Content-Type": "application/json",
-                    "Access-Control-Allow-Origin": "*"
-                },
-                "body": json.dumps({
-                    "error": "INVALID_WORKFLOW",
-                    "message": f"Unknown workflow: {workflow_type}"
-                })
+                "headers": _CORS_HEADERS,
+                "body": _invalid_workflow_body(workflow_type)
             }
 
-        # Execute workflow (synchronous)
-        import asyncio
-        workflow = workflows[workflow_type]
-        result = asyncio.run(workflow.execute(input_data))
+        # Execute workflow on the shared container event loop
+        workflow = _get_workflow(workflow_type)
+        result = _LOOP.run_until_complete(workflow.execute(input_data))
 
         # Return response
         return {
             "statusCode": 200 if result.get("success") else 500,
-            "headers": {
-                "Content-Type": "application/json",
-                "Access-Control-Allow-Origin": "*"
-            },
-            "body": json.dumps({
-                "success": result.get("success"),
-                "data": result.get("data"),
-                "metadata": result.get("metadata"),
-                "errors": result.get("errors", [])
-            })
+            "headers": _CORS_HEADERS,
+            "body": _encode_envelope(
+                bool(result.get("success")),
+                result.get("data"),
+                result.get("metadata"),
+                result.get("errors", [])
+            )
         }
 
     except Exception as e:
-        logger.error(f"Error processing request: {str(e)}", exc_info=True)
+        logger.error("Error processing request: %s", str(e), exc_info=True)
 
         return {
             "statusCode": 500,
-            "headers": {
-                "Content-Type": "application/json",
-                "Access-Control-Allow-Origin": "*"
-            },
-            "body": json.dumps({
+            "headers": _CORS_HEADERS,
+            "body": _dumps({
                 "error": "INTERNAL_ERROR",
                 "message": str(e)
             })
@@ -129,12 +220,9 @@ def health_check_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
     """
     return {
         "statusCode": 200,
-        "headers": {
-            "Content-Type": "application/json"
-        },
-        "body": json.dumps({
-            "status": "healthy",
-            "workflows": list(workflows.keys()),
+        "headers": _JSON_HEADERS,
+        "body": _dumps({
+            **_HEALTH_STATIC,
             "function": context.function_name,
             "version": context.function_version
         })
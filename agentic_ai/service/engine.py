@@ -4,10 +4,21 @@ import asyncio
 import hashlib
 import json
 import logging
+from functools import lru_cache
 from typing import TYPE_CHECKING, Any, Callable, Dict, Optional
 
+try:
+    import orjson
+except Exception:  # pragma: no cover - optional dependency
+    orjson = None
+
+try:
+    import xxhash
+except Exception:  # pragma: no cover - optional dependency
+    xxhash = None
+
 from ..utils.cache import CacheClient
-from ..utils.metrics import MetricsCollector
+from ..utils.metrics import get_metrics_collector
 from ..utils.costs import CostTracker
 from ..workflows.state_manager import StateManager
 
@@ -15,15 +26,70 @@ if TYPE_CHECKING:
     from ..mcp_client import MCPClientConfig, MCPToolClient
 
 
+# Canonical (sorted-key) byte serializer for cache-key payloads, bound once
+# so per-call work is a single C function invocation
+if orjson:
+    _CANONICAL_OPTS = orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS
+
+    def _canonical_dumps(payload: Any) -> bytes:
+        return orjson.dumps(payload, option=_CANONICAL_OPTS, default=str)
+else:
+    def _canonical_dumps(payload: Any) -> bytes:
+        return json.dumps(payload, sort_keys=True, default=str).encode("utf-8")
+
+
+def _noop(*args: Any, **kwargs: Any) -> None:
+    """No-op stand-in for metric hooks when monitoring is disabled."""
+    return None
+
+
+#: Only payloads this small are memoized: the LRU retains its keys, so
+#: holding full user/pet dicts (unique per request) would be pure overhead
+_DIGEST_MEMO_MAX_BYTES = 256
+
+
+def _hash_bytes(raw: bytes, crypto: bool) -> str:
+    if xxhash and not crypto:
+        return xxhash.xxh3_64_hexdigest(raw)
+    return hashlib.sha256(raw).hexdigest()
+
+
+@lru_cache(maxsize=4096)
+def _memoized_digest(raw: bytes, crypto: bool) -> str:
+    return _hash_bytes(raw, crypto)
+
+
+def _digest_for(raw: bytes, crypto: bool) -> str:
+    """Digest canonical payload bytes.
+
+    Short id-fingerprint payloads are memoized so repeat calls skip the
+    hash; large payloads (full user/pet dicts with near-zero repeat rate)
+    are hashed directly to keep them out of the LRU.
+    """
+    if len(raw) <= _DIGEST_MEMO_MAX_BYTES:
+        return _memoized_digest(raw, crypto)
+    return _hash_bytes(raw, crypto)
+
+
 class AgenticEngine:
     """Orchestrates workflows, caching, and metrics for API usage."""
 
     def __init__(self, config: Dict[str, Any]):
         self.config = config
         self.logger = logging.getLogger("agentic_engine")
-        self.metrics = MetricsCollector() if config.get("monitoring", {}).get("enabled") else None
+        self.metrics = (
+            get_metrics_collector() if config.get("monitoring", {}).get("enabled") else None
+        )
         self.cost_tracker = CostTracker(config, metrics=self.metrics)
         self.cache = CacheClient(config.get("cache", {}))
+        # Hoisted flag: cache-disabled deployments skip key-payload
+        # construction entirely on every request
+        self._cache_enabled = self.cache.enabled
+        # Cache keys only need collision resistance, not cryptographic
+        # strength: prefer xxh3 unless the config insists otherwise
+        self._require_crypto_keys = config.get("cache", {}).get(
+            "require_cryptographic", False
+        )
         storage_cfg = config.get("storage", {})
         storage_type = storage_cfg.get("type", "local")
         self.state_manager = (
@@ -45,14 +111,60 @@ class AgenticEngine:
         self._workflows: Dict[str, Any] = {}
         self._workflow_lock = asyncio.Lock()
 
+        # Branchless metric hooks: bound once here so _execute never tests
+        # whether monitoring is enabled
+        if self.metrics:
+            self._on_request_start = self.metrics.increment_active_requests
+            self._on_request_end = self.metrics.decrement_active_requests
+            self._record_result = self._record_result_metrics
+        else:
+            self._on_request_start = _noop
+            self._on_request_end = _noop
+            self._record_result = _noop
+
     async def close(self) -> None:
+        if self.state_manager:
+            await self.state_manager.flush()
+        self.cost_tracker.close()
         await self.cache.close()
 
+    async def prewarm(self, workflows: Optional[list] = None) -> None:
+        """
+        Build workflows ahead of first use, concurrently.
+
+        Construction is blocking (LLM client init, graph compile), so each
+        builder runs on a worker thread and they overlap instead of paying
+        their sum sequentially.
+        """
+        names = [
+            name
+            for name in (workflows or self.list_workflows())
+            if name in self._workflow_builders and name not in self._workflows
+        ]
+        if not names:
+            return
+
+        built = await asyncio.gather(
+            *[asyncio.to_thread(self._workflow_builders[name]) for name in names]
+        )
+        async with self._workflow_lock:
+            for name, workflow in zip(names, built):
+                self._workflows.setdefault(name, workflow)
+
     async def analyze_pet(self, pet: Dict[str, Any]) -> Dict[str, Any]:
-        cache_key = self._cache_key("analysis", pet, pet.get("id"))
-        cached = await self.cache.get_json(cache_key) if cache_key else None
-        if cached:
-            return cached
+        cache_key = (
+            self._cache_key("analysis", pet, pet.get("id"))
+            if self._cache_enabled
+            else None
+        )
+        if cache_key:
+            # Overlap the cache round-trip with workflow warm-up
+            cached, _ = await asyncio.gather(
+                self.cache.get_json(cache_key),
+                self._get_workflow("analysis"),
+            )
+            if cached:
+                return cached
 
         result = await self._execute("analysis", {"pet": pet})
         data = {
@@ -64,14 +176,22 @@ class AgenticEngine:
         return data
 
     async def profile_user(self, user: Dict[str, Any], swipe_history: list) -> Dict[str, Any]:
-        cache_key = self._cache_key(
-            "profile",
-            {"user": user, "swipe_history": swipe_history},
-            user.get("id"),
+        cache_key = (
+            self._cache_key(
+                "profile",
+                {"user": user, "swipe_history": swipe_history},
+                user.get("id"),
+            )
+            if self._cache_enabled
+            else None
         )
-        cached = await self.cache.get_json(cache_key) if cache_key else None
-        if cached:
-            return cached
+        if cache_key:
+            cached, _ = await asyncio.gather(
+                self.cache.get_json(cache_key),
+                self._get_workflow("profile"),
+            )
+            if cached:
+                return cached
 
         result = await self._execute(
             "profile",
@@ -91,14 +211,28 @@ class AgenticEngine:
         swipe_history: list,
         pet_candidates: list,
     ) -> Dict[str, Any]:
-        cache_key = self._cache_key(
-            "match",
-            {"user": user, "pet_candidates": pet_candidates},
-            None,
+        # Key on user id + candidate ids: an order of magnitude less data to
+        # serialize and hash than the full candidate dicts. Anonymous users
+        # (no id) fall back to the full user payload so two different users
+        # never share one personalized cache entry.
+        cache_key = (
+            self._cache_key(
+                "match",
+                self._match_key_payload(user, pet_candidates),
+                None,
+            )
+            if self._cache_enabled
+            else None
         )
-        cached = await self.cache.get_json(cache_key) if cache_key else None
-        if cached:
-            return cached
+        if cache_key:
+            cached, _ = await asyncio.gather(
+                self.cache.get_json(cache_key),
+                self._get_workflow("match"),
+            )
+            if cached:
+                return cached
+
+        await self._attach_cached_analyses(pet_candidates)
 
         result = await self._execute(
             "match",
@@ -122,14 +256,24 @@ class AgenticEngine:
         swipe_history: list,
         pet_candidates: list,
     ) -> Dict[str, Any]:
-        cache_key = self._cache_key(
-            "recommendation",
-            {"user": user, "pet_candidates": pet_candidates},
-            None,
+        cache_key = (
+            self._cache_key(
+                "recommendation",
+                self._match_key_payload(user, pet_candidates),
+                None,
+            )
+            if self._cache_enabled
+            else None
         )
-        cached = await self.cache.get_json(cache_key) if cache_key else None
-        if cached:
-            return cached
+        if cache_key:
+            cached, _ = await asyncio.gather(
+                self.cache.get_json(cache_key),
+                self._get_workflow("recommendation"),
+            )
+            if cached:
+                return cached
+
+        await self._attach_cached_analyses(pet_candidates)
 
         result = await self._execute(
             "recommendation",
@@ -147,16 +291,57 @@ class AgenticEngine:
             await self.cache.set_json(cache_key, data)
         return data
 
+    @staticmethod
+    def _match_key_payload(user: Dict[str, Any], pet_candidates: list) -> Dict[str, Any]:
+        """Build the cache-key payload for match/recommendation requests."""
+        cand_ids = [p.get("id") for p in pet_candidates]
+        uid = user.get("id")
+        if uid:
+            return {"uid": uid, "cand_ids": cand_ids}
+        return {"user": user, "cand_ids": cand_ids}
+
+    async def _attach_cached_analyses(self, pet_candidates: list) -> None:
+        """Prefetch cached per-pet analyses in one round-trip and attach them."""
+        if not self._cache_enabled or not pet_candidates:
+            return
+
+        wanted = [
+            (i, pet.get("id"))
+            for i, pet in enumerate(pet_candidates)
+            if pet.get("id") and not pet.get("pet_analysis")
+        ]
+        if not wanted:
+            return
+
+        cached = await self.cache.mget_json([f"analysis:{pid}" for _, pid in wanted])
+        for (i, _), entry in zip(wanted, cached):
+            if entry and entry.get("analysis"):
+                pet_candidates[i]["pet_analysis"] = entry["analysis"]
+
     async def chat(self, message: str, context: Dict[str, Any]) -> Dict[str, Any]:
         result = await self._execute(
             "conversation",
             {"message": message, "context": context},
         )
+        data = result.get("data", {})
         return {
-            "response": result.get("data", {}).get("response", ""),
-            "conversation_history": result.get("data", {}).get("conversation_history", []),
+            "response": data.get("response", ""),
+            "conversation_history": data.get("conversation_history", []),
         }
 
+    async def chat_stream(self, message: str, context: Dict[str, Any]):
+        """Stream chat response chunks as the LLM generates them."""
+        pipeline = await self._get_workflow("conversation")
+        agent = pipeline.agents.get("Conversationalist")
+        if agent is None:
+            # Fall back to the buffered path if the workflow shape changed
+            result = await self.chat(message, context)
+            yield result["response"]
+            return
+
+        async for chunk in agent.stream_response(message, context):
+            yield chunk
+
     @property
     def mcp_client_enabled(self) -> bool:
         return bool(self.config.get("mcp_client", {}).get("enabled", False))
@@ -231,41 +416,46 @@ class AgenticEngine:
 
     async def _execute(self, workflow: str, input_data: Dict[str, Any]) -> Dict[str, Any]:
         wf = await self._get_workflow(workflow)
-        if self.metrics:
-            self.metrics.increment_active_requests()
+
+        self._on_request_start()
         try:
             result = await wf.execute(input_data)
         finally:
-            if self.metrics:
-                self.metrics.decrement_active_requests()
+            self._on_request_end()
 
-        status = "success" if result.get("success") else "error"
-        if self.metrics:
-            self.metrics.record_request(workflow, status)
-            for agent_result in result.get("agent_results", []):
-                self.metrics.record_processing_time(
-                    workflow,
-                    agent_result.get("agent", "unknown"),
-                    agent_result.get("processing_time", 0.0),
-                )
-                for error in agent_result.get("errors", []):
-                    self.metrics.record_error(
-                        agent_result.get("agent", "unknown"),
-                        type(error).__name__,
-                    )
+        self._record_result(workflow, result)
 
         if self.state_manager:
-            await self.state_manager.save_state(workflow, result)
+            # Non-blocking: disk persistence happens on the background flusher
+            self.state_manager.enqueue_save(workflow, result)
         return result
 
+    def _record_result_metrics(self, workflow: str, result: Dict[str, Any]) -> None:
+        """Record per-workflow and per-agent metrics for an execution result."""
+        metrics = self.metrics
+        status = "success" if result.get("success") else "error"
+        metrics.record_request(workflow, status)
+
+        record_time = metrics.record_processing_time
+        record_error = metrics.record_error
+        for agent_result in result.get("agent_results", []):
+            agent_name = agent_result.get("agent", "unknown")
+            record_time(
+                workflow,
+                agent_name,
+                agent_result.get("processing_time", 0.0),
+            )
+            for error in agent_result.get("errors", []):
+                record_error(agent_name, type(error).__name__)
+
     def _cache_key(self, prefix: str, payload: Dict[str, Any], entity_id: Optional[str]) -> Optional[str]:
         if not self.cache.enabled:
             return None
         if entity_id:
             return f"{prefix}:{entity_id}"
+        # Serialize straight to bytes: no intermediate str + encode copy
         try:
-            raw = json.dumps(payload, sort_keys=True, default=str)
+            raw = _canonical_dumps(payload)
         except TypeError:
             return None
-        digest = hashlib.sha256(raw.encode("utf-8")).hexdigest()
-        return f"{prefix}:{digest}"
+        return f"{prefix}:{_digest_for(raw, self._require_crypto_keys)}"
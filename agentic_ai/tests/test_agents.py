@@ -3,7 +3,12 @@ Test cases for agents.
 """
 
 import pytest
-from agentic_ai.agents import PetAnalyzerAgent, UserProfilerAgent
+from agentic_ai.agents import (
+    ConversationAgent,
+    MatchingAgent,
+    PetAnalyzerAgent,
+    UserProfilerAgent,
+)
 from agentic_ai.agents.base_agent import AgentState
 from datetime import datetime
 
@@ -90,6 +95,185 @@ async def test_pet_analyzer_agent(config, sample_pet):
     assert agent.name == "PetAnalyzer"
 
 
+def test_agent_state_pack_roundtrip():
+    """Test binary state transport serialization."""
+    state = AgentState(
+        agent_name="TestAgent",
+        timestamp=datetime.now(),
+        data={"key": "value"},
+        metadata={"meta": 1},
+        errors=["oops"]
+    )
+
+    restored = AgentState.unpack(state.pack())
+
+    assert restored.agent_name == "TestAgent"
+    assert restored.data == {"key": "value"}
+    assert restored.metadata == {"meta": 1}
+    assert restored.errors == ["oops"]
+    assert abs(restored.timestamp.timestamp() - state.timestamp.timestamp()) < 1e-3
+
+
+@pytest.mark.asyncio
+async def test_matching_agent_ranks_preferred_types_first():
+    """Test vectorized matching scores and ranking."""
+    agent = MatchingAgent({
+        "agents": {"matching": {"min_score_threshold": 0.5, "randomness_weight": 0.0}}
+    })
+
+    state = AgentState(
+        agent_name=agent.name,
+        timestamp=datetime.now(),
+        data={
+            "user_profile": {
+                "id": "user-123",
+                "preferences": {"pet_types": ["Dog"]}
+            },
+            "pet_candidates": [
+                {"id": "pet-1", "type": "Cat"},
+                {"id": "pet-2", "type": "Dog"},
+            ]
+        },
+        metadata={},
+        errors=[]
+    )
+
+    result = await agent.process(state)
+
+    assert result.errors == []
+    assert result.data["total_candidates"] == 2
+    assert result.data["qualified_matches"] == 2
+    assert result.data["matches"][0]["pet"]["id"] == "pet-2"
+    assert result.data["matches"][0]["score"] > result.data["matches"][1]["score"]
+
+
+@pytest.mark.asyncio
+async def test_matching_submit_coalesces_concurrent_requests():
+    """Test that submits inside the window share one batch dispatch."""
+    import asyncio
+
+    agent = MatchingAgent({
+        "agents": {"matching": {"batch_window_ms": 50, "randomness_weight": 0.0}}
+    })
+
+    batch_sizes = []
+    original_score_batch = agent._score_batch
+
+    def tracking_score_batch(requests):
+        batch_sizes.append(len(requests))
+        return original_score_batch(requests)
+
+    agent._score_batch = tracking_score_batch
+
+    profile = {"id": "user-123", "preferences": {"pet_types": ["Dog"]}}
+    candidates = [{"id": "pet-1", "type": "Dog"}, {"id": "pet-2", "type": "Cat"}]
+
+    results = await asyncio.gather(
+        agent.submit(profile, candidates),
+        agent.submit(profile, candidates),
+    )
+
+    assert batch_sizes == [2]
+    for matches, qualified in results:
+        assert qualified == 2
+        assert matches[0]["pet"]["id"] == "pet-1"
+
+    await agent.close()
+    assert agent._collector_task is None
+
+
+@pytest.mark.asyncio
+async def test_monitoring_agent_summary_and_export():
+    """Test ring-buffered metrics, running aggregates, and export timestamps."""
+    import json as json_module
+    from agentic_ai.agents import MonitoringAgent
+
+    agent = MonitoringAgent({"metrics_ring": 2})
+
+    for success in (True, False, True):
+        state = AgentState(
+            agent_name=agent.name,
+            timestamp=datetime.now(),
+            data={"execution_data": {
+                "pipeline_id": "p1",
+                "total_time": 1.0,
+                "success": success,
+                "errors": [] if success else ["boom"],
+            }},
+            metadata={},
+            errors=[]
+        )
+        await agent.process(state)
+
+    # Ring evicted the first record; aggregates track the surviving two
+    agent.flush()
+    assert len(agent.metrics_store) == 2
+    summary = agent.get_metrics_summary()
+    assert summary["total_executions"] == 2
+    assert summary["successful"] == 1
+
+    exported = json_module.loads(agent.export_metrics())
+    assert len(exported) == 2
+    assert all("timestamp" in record for record in exported)
+
+
+@pytest.mark.asyncio
+async def test_conversation_process_many(config):
+    """Test batched conversation processing with a stubbed LLM."""
+    agent = ConversationAgent(config)
+
+    class StubLLM:
+        async def apredict_messages(self, messages):
+            class Response:
+                content = "Here to help!"
+            return Response()
+
+    agent.llm = StubLLM()
+
+    states = [
+        AgentState(
+            agent_name=agent.name,
+            timestamp=datetime.now(),
+            data={"message": f"Question {i}", "context": {}},
+            metadata={},
+            errors=[]
+        )
+        for i in range(3)
+    ]
+    states.append(AgentState(
+        agent_name=agent.name,
+        timestamp=datetime.now(),
+        data={},
+        metadata={},
+        errors=[]
+    ))
+
+    results = await agent.process_many(states)
+
+    assert len(results) == 4
+    for state in results[:3]:
+        assert state.data["response"] == "Here to help!"
+        assert state.metadata["response_generated"] is True
+    assert results[3].errors == ["No message provided"]
+
+
+def test_recommendation_diversification_interleaves_types(config):
+    """Test round-robin diversification across pet types."""
+    from agentic_ai.agents import RecommendationAgent
+
+    agent = RecommendationAgent(config)
+    recommendations = [
+        {"pet": {"id": f"dog-{i}", "type": "Dog"}, "score": 0.9 - i * 0.01}
+        for i in range(3)
+    ] + [{"pet": {"id": "cat-0", "type": "Cat"}, "score": 0.5}]
+
+    diversified = agent._diversify_recommendations(recommendations)
+
+    assert len(diversified) == 4
+    # The cat is promoted into the first round instead of trailing all dogs
+    assert {r["pet"]["type"] for r in diversified[:2]} == {"Dog", "Cat"}
+
+
 @pytest.mark.asyncio
 async def test_user_profiler_agent(config, sample_user):
     """Test user profiler agent."""
@@ -97,3 +281,30 @@ async def test_user_profiler_agent(config, sample_user):
     # In production, you would mock the OpenAI API
     agent = UserProfilerAgent(config)
     assert agent.name == "UserProfiler"
+
+
+@pytest.mark.asyncio
+async def test_user_profiler_skips_llm_on_cold_start(config, sample_user):
+    """Test deterministic preferences for users with tiny swipe histories."""
+    agent = UserProfilerAgent(config)
+
+    class ExplodingLLM:
+        async def apredict_messages(self, messages):
+            raise AssertionError("LLM should not be called for cold-start users")
+
+    agent.llm = ExplodingLLM()
+
+    state = AgentState(
+        agent_name=agent.name,
+        timestamp=datetime.now(),
+        data={"user": sample_user, "swipe_history": []},
+        metadata={},
+        errors=[]
+    )
+
+    result = await agent.process(state)
+
+    assert result.errors == []
+    profile = result.data["user_profile"]
+    assert profile["preferences"]["ai_insights"] == ""
+    assert profile["swipe_analysis"]["total_swipes"] == 0
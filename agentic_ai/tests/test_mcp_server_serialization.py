@@ -4,7 +4,7 @@ from types import SimpleNamespace
 
 import pytest
 
-from mcp_server.serialization import to_jsonable
+from mcp_server.serialization import from_msgpack, to_jsonable, to_msgpack
 from mcp_server.settings import MCPServerSettings
 
 
@@ -18,6 +18,12 @@ def test_to_jsonable_model_dump():
     assert payload == {"m": {"x": 1, "nested": {"y": [1, 2, 3]}}}
 
 
+def test_msgpack_roundtrip():
+    pytest.importorskip("msgpack")
+    payload = {"m": _DummyModel(), "items": [1, 2, 3]}
+    assert from_msgpack(to_msgpack(payload)) == to_jsonable(payload)
+
+
 def test_mcp_server_settings_from_cli():
     args = SimpleNamespace(
         transport="stdio",
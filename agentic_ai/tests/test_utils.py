@@ -6,8 +6,10 @@ import asyncio
 
 import pytest
 
-from agentic_ai.utils.cache import CacheClient
+from agentic_ai.utils.cache import CacheClient, SemanticResponseCache
 from agentic_ai.utils.config import resolve_agent_config, validate_mcp_configuration
+from agentic_ai.utils.exact_cache import ExactCache
+from agentic_ai.utils.prompt_trim import trim
 from agentic_ai.utils.security import RateLimiter
 
 
@@ -27,6 +29,20 @@ async def test_cache_client_memory_ttl():
     assert await cache.get_json("k1") is None
 
 
+def test_semantic_response_cache_tiers():
+    cache = SemanticResponseCache({"enabled": True, "similarity_threshold": 0.9})
+    key = SemanticResponseCache.make_key("is this dog good with kids?", {})
+
+    assert cache.get_exact(key) is None
+    cache.put(key, "Yes, very gentle.", embedding=[1.0, 0.0, 0.0])
+    assert cache.get_exact(key) == "Yes, very gentle."
+
+    # Near-duplicate question hits the semantic tier
+    assert cache.find_similar([0.99, 0.05, 0.0]) == "Yes, very gentle."
+    # Unrelated question misses
+    assert cache.find_similar([0.0, 1.0, 0.0]) is None
+
+
 @pytest.mark.asyncio
 async def test_rate_limiter():
     limiter = RateLimiter(2)
@@ -35,6 +51,31 @@ async def test_rate_limiter():
     assert not await limiter.allow("client")
 
 
+def test_exact_cache_survives_reopen(tmp_path):
+    db_path = str(tmp_path / "analysis.db")
+    cache = ExactCache({"enabled": True, "path": db_path})
+    key = ExactCache.content_key({"name": "Buddy", "type": "Dog"})
+
+    assert cache.get(key) is None
+    cache.put(key, {"summary": "friendly"})
+    assert cache.get(key) == {"summary": "friendly"}
+    cache.close()
+
+    reopened = ExactCache({"enabled": True, "path": db_path})
+    assert reopened.get(key) == {"summary": "friendly"}
+    reopened.close()
+
+
+def test_trim_caps_strings_and_dict_entries():
+    obj = {
+        "description": "x" * 2000,
+        "type_distribution": {f"type-{i}": i for i in range(50)},
+    }
+    trimmed = trim(obj, 100)
+    assert len(trimmed["description"]) < 2000
+    assert len(trimmed.get("type_distribution", {})) <= 10
+
+
 def test_validate_mcp_configuration_invalid_client_url():
     config = {
         "mcp": {"transport": "stdio", "port": 8766, "path": "/mcp"},
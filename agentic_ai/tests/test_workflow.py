@@ -61,6 +61,16 @@ def test_pipeline_build(config):
     assert pipeline.compiled_graph is not None
 
 
+def test_pipeline_dependency_layers(config):
+    """Test that independent agents land in one concurrent layer."""
+    pipeline = WorkflowBuilder.build_match_workflow(config)
+    layers = pipeline._topological_layers()
+
+    assert layers[0] == ["UserProfiler", "PetAnalyzer"]
+    assert layers[1] == ["Matcher"]
+    assert layers[2] == ["Monitor"]
+
+
 def test_workflow_builder(config):
     """Test workflow builder."""
     pipeline = WorkflowBuilder.build_analysis_workflow(config)
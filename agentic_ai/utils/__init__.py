@@ -21,6 +21,9 @@ _EXPORTS = {
         "agentic_ai.utils.costs",
         "CostTrackingCallbackHandler",
     ),
+    "trim": ("agentic_ai.utils.prompt_trim", "trim"),
+    "ExactCache": ("agentic_ai.utils.exact_cache", "ExactCache"),
+    "TokenCounter": ("agentic_ai.utils.tokens", "TokenCounter"),
 }
 
 __all__ = list(_EXPORTS.keys())
@@ -1,18 +1,43 @@
 """Caching utilities."""
 
+import hashlib
 import json
 import time
 import asyncio
+from collections import OrderedDict
 from dataclasses import dataclass
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List, Optional
+
+import numpy as np
 
 try:
     import redis.asyncio as redis
 except Exception:  # pragma: no cover - optional dependency
     redis = None
 
+try:
+    import msgpack
+except Exception:  # pragma: no cover - optional dependency
+    msgpack = None
+
+
+#: Connection pools shared across CacheClient instances, keyed by URL
+_REDIS_POOLS: Dict[str, Any] = {}
+
+
+def _get_redis(redis_url: str, pool_size: int, decode_responses: bool = True):
+    """Return a Redis client backed by the shared pool for this URL."""
+    pool_key = f"{redis_url}|{decode_responses}"
+    pool = _REDIS_POOLS.get(pool_key)
+    if pool is None:
+        pool = redis.ConnectionPool.from_url(
+            redis_url, decode_responses=decode_responses, max_connections=pool_size
+        )
+        _REDIS_POOLS[pool_key] = pool
+    return redis.Redis(connection_pool=pool)
 
-@dataclass
+
+@dataclass(slots=True)
 class CacheEntry:
     value: Any
     expires_at: Optional[float]
@@ -26,12 +51,36 @@ class CacheClient:
         self.backend = config.get("backend", "memory")
         self.redis_url = config.get("redis_url")
         self.default_ttl = config.get("ttl", 3600)
-        self._memory: Dict[str, CacheEntry] = {}
+        # Bounded LRU with lazy TTL expiry: the memory backend must not grow
+        # without limit under write-heavy workloads
+        self.max_items = config.get("max_items", 10_000)
+        self._memory: "OrderedDict[str, CacheEntry]" = OrderedDict()
         self._lock = asyncio.Lock()
         self._redis = None
 
+        # Optional write batching: concurrent set_json calls within the flush
+        # window coalesce into one pipelined round-trip
+        batching_cfg = config.get("write_batching", {})
+        self._batching_enabled = batching_cfg.get("enabled", False)
+        self._batch_max = batching_cfg.get("batch_max", 32)
+        self._flush_ms = batching_cfg.get("flush_ms", 50)
+        self._write_queue: Optional[asyncio.Queue] = None
+        self._writer_task = None
+
+        # msgpack payloads are smaller and faster to decode than JSON for
+        # large result objects; requires the optional msgpack dependency
+        self.backend_format = config.get("backend_format", "json")
+        if self.backend_format == "msgpack" and msgpack is None:
+            self.backend_format = "json"
+
         if self.enabled and self.backend == "redis" and redis:
-            self._redis = redis.from_url(self.redis_url, decode_responses=True)
+            # Clients over the same URL share one capped connection pool, so
+            # engine rebuilds never open fresh socket sets
+            self._redis = _get_redis(
+                self.redis_url,
+                config.get("pool_size", 32),
+                decode_responses=self.backend_format != "msgpack",
+            )
 
     async def get_json(self, key: str) -> Optional[Any]:
         if not self.enabled:
@@ -39,16 +88,43 @@ class CacheClient:
 
         if self.backend == "redis" and self._redis:
             raw = await self._redis.get(key)
-            return json.loads(raw) if raw else None
-
-        async with self._lock:
-            entry = self._memory.get(key)
-            if not entry:
-                return None
-            if entry.expires_at and time.time() > entry.expires_at:
-                self._memory.pop(key, None)
+            if not raw:
                 return None
-            return entry.value
+            if self.backend_format == "msgpack":
+                return msgpack.unpackb(raw, raw=False)
+            return json.loads(raw)
+
+        # Lock-free read path: dict operations never yield to the event loop
+        # and are atomic under the GIL, so readers skip the lock entirely
+        entry = self._memory.get(key)
+        if not entry:
+            return None
+        if entry.expires_at and time.time() > entry.expires_at:
+            self._memory.pop(key, None)
+            return None
+        try:
+            self._memory.move_to_end(key)
+        except KeyError:  # pragma: no cover - concurrent eviction
+            return None
+        return entry.value
+
+    async def mget_json(self, keys: List[str]) -> List[Optional[Any]]:
+        """
+        Fetch many keys in one round-trip.
+
+        For Redis this is a single MGET instead of N GETs; for the memory
+        backend it is one pass over the dict.
+        """
+        if not self.enabled or not keys:
+            return [None] * len(keys)
+
+        if self.backend == "redis" and self._redis:
+            raws = await self._redis.mget(keys)
+            if self.backend_format == "msgpack":
+                return [msgpack.unpackb(r, raw=False) if r else None for r in raws]
+            return [json.loads(r) if r else None for r in raws]
+
+        return [await self.get_json(key) for key in keys]
 
     async def set_json(self, key: str, value: Any, ttl: Optional[int] = None) -> None:
         if not self.enabled:
@@ -57,14 +133,159 @@ class CacheClient:
         ttl = ttl if ttl is not None else self.default_ttl
 
         if self.backend == "redis" and self._redis:
-            payload = json.dumps(value)
+            if self.backend_format == "msgpack":
+                payload = msgpack.packb(value, use_bin_type=True, default=str)
+            else:
+                payload = json.dumps(value)
+            if self._batching_enabled:
+                self._enqueue_write(key, payload, ttl)
+                return
             await self._redis.set(key, payload, ex=ttl)
             return
 
         expires_at = time.time() + ttl if ttl else None
         async with self._lock:
             self._memory[key] = CacheEntry(value=value, expires_at=expires_at)
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.max_items:
+                self._memory.popitem(last=False)
+
+    def _enqueue_write(self, key: str, payload: str, ttl: Optional[int]) -> None:
+        """Queue a write for the background pipeline flusher."""
+        if self._write_queue is None:
+            self._write_queue = asyncio.Queue()
+            self._writer_task = asyncio.get_running_loop().create_task(
+                self._drain_writes()
+            )
+        self._write_queue.put_nowait((key, payload, ttl))
+
+    async def _drain_writes(self) -> None:
+        """Flush queued writes in pipelined batches."""
+        loop = asyncio.get_running_loop()
+        window = self._flush_ms / 1000.0
+
+        while True:
+            batch = [await self._write_queue.get()]
+
+            deadline = loop.time() + window
+            while len(batch) < self._batch_max:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(
+                        await asyncio.wait_for(self._write_queue.get(), timeout)
+                    )
+                except asyncio.TimeoutError:
+                    break
+
+            pipe = self._redis.pipeline(transaction=False)
+            for key, payload, ttl in batch:
+                pipe.set(key, payload, ex=ttl)
+            try:
+                await pipe.execute()
+            except Exception:  # pragma: no cover - Redis unavailable
+                pass
+            finally:
+                for _ in batch:
+                    self._write_queue.task_done()
+
+    async def flush(self) -> None:
+        """Block until queued writes have been flushed to Redis."""
+        if self._write_queue is not None:
+            await self._write_queue.join()
 
     async def close(self) -> None:
+        if self._writer_task is not None:
+            await self.flush()
+            self._writer_task.cancel()
+            self._writer_task = None
         if self._redis:
             await self._redis.close()
+
+
+class SemanticResponseCache:
+    """
+    Two-tier in-memory cache for LLM responses.
+
+    Tier 1 is an exact-key LRU dict keyed by a blake2b digest of the prompt
+    inputs. Tier 2 is an embedding-similarity lookup: cached embeddings are
+    stored row-normalized in a geometrically grown matrix so a lookup is a
+    single dot product.
+    """
+
+    _INITIAL_ROWS = 64
+
+    def __init__(self, config: Dict[str, Any]):
+        self.enabled = config.get("enabled", False)
+        self.maxsize = config.get("maxsize", 10_000)
+        self.similarity_threshold = config.get("similarity_threshold", 0.95)
+        self._exact: "OrderedDict[str, Any]" = OrderedDict()
+        self._embeddings: Optional[np.ndarray] = None
+        self._responses: List[Any] = []
+
+    @staticmethod
+    def make_key(text: str, context: Any = None) -> str:
+        """Build a stable exact-tier key from prompt text and context."""
+        payload = text
+        if context:
+            payload += json.dumps(context, sort_keys=True, default=str)
+        return hashlib.blake2b(payload.encode("utf-8")).hexdigest()
+
+    def get_exact(self, key: str) -> Optional[Any]:
+        """Look up the exact tier, refreshing LRU position on hit."""
+        if not self.enabled:
+            return None
+        value = self._exact.get(key)
+        if value is not None:
+            self._exact.move_to_end(key)
+        return value
+
+    def find_similar(self, embedding: List[float]) -> Optional[Any]:
+        """Return the cached response most similar to the embedding, if any."""
+        if not self.enabled or not self._responses:
+            return None
+
+        query = np.asarray(embedding, dtype=np.float32)
+        norm = np.linalg.norm(query)
+        if norm == 0:
+            return None
+        query /= norm
+
+        sims = self._embeddings[: len(self._responses)] @ query
+        best = int(np.argmax(sims))
+        if sims[best] >= self.similarity_threshold:
+            return self._responses[best]
+        return None
+
+    def put(self, key: str, value: Any, embedding: Optional[List[float]] = None) -> None:
+        """Insert a response into both tiers, evicting LRU entries as needed."""
+        if not self.enabled:
+            return
+
+        self._exact[key] = value
+        self._exact.move_to_end(key)
+        while len(self._exact) > self.maxsize:
+            self._exact.popitem(last=False)
+
+        if embedding is None or len(self._responses) >= self.maxsize:
+            return
+
+        row = np.asarray(embedding, dtype=np.float32)
+        norm = np.linalg.norm(row)
+        if norm == 0:
+            return
+        row /= norm
+
+        if self._embeddings is None:
+            self._embeddings = np.zeros((self._INITIAL_ROWS, row.shape[0]), dtype=np.float32)
+        elif len(self._responses) >= self._embeddings.shape[0]:
+            grown = np.zeros(
+                (self._embeddings.shape[0] * 2, self._embeddings.shape[1]),
+                dtype=np.float32,
+            )
+            grown[: self._embeddings.shape[0]] = self._embeddings
+            self._embeddings = grown
+
+        self._embeddings[len(self._responses)] = row
+        self._responses.append(value)
@@ -2,12 +2,14 @@
 
 import yaml
 import os
+import threading
 from typing import Any, Dict, Optional
 from pathlib import Path
 
 
 _config_cache: Optional[Dict[str, Any]] = None
 _config_cache_key: Optional[str] = None
+_config_lock = threading.Lock()
 
 
 def load_config(config_path: str = "config/config.yaml") -> Dict[str, Any]:
@@ -29,14 +31,22 @@ def load_config(config_path: str = "config/config.yaml") -> Dict[str, Any]:
     if _config_cache is not None and _config_cache_key == cache_key:
         return _config_cache
 
-    with open(resolved_path, "r") as f:
-        _config_cache = yaml.safe_load(f) or {}
-    _config_cache_key = cache_key
+    # Double-checked lock: multi-threaded workers must not race the YAML
+    # parse or the cache-global writes
+    with _config_lock:
+        if _config_cache is not None and _config_cache_key == cache_key:
+            return _config_cache
 
-    _config_cache = _apply_env_overrides(_config_cache)
-    _ensure_paths(_config_cache)
-    validate_costs(_config_cache)
-    validate_mcp_configuration(_config_cache)
+        with open(resolved_path, "r") as f:
+            config = yaml.safe_load(f) or {}
+
+        config = _apply_env_overrides(config)
+        _ensure_paths(config)
+        validate_costs(config)
+        validate_mcp_configuration(config)
+
+        _config_cache = config
+        _config_cache_key = cache_key
 
     return _config_cache
 
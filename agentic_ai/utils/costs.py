@@ -2,7 +2,12 @@
 
 import json
 import logging
-from collections import deque
+import queue
+import threading
+import time
+from bisect import bisect_left
+from itertools import islice
+from collections import OrderedDict, defaultdict, deque
 from dataclasses import dataclass
 from datetime import datetime, timedelta
 from pathlib import Path
@@ -20,8 +25,17 @@ except Exception:  # pragma: no cover - optional dependency fallback
 
 from .context import get_context
 
+try:
+    import orjson
+
+    def _dumps(obj: Any) -> str:
+        return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS, default=str).decode()
+except ImportError:  # pragma: no cover - optional dependency
+    def _dumps(obj: Any) -> str:
+        return json.dumps(obj, default=str)
+
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class ModelPricing:
     input_per_1k: float
     output_per_1k: float
@@ -34,6 +48,22 @@ class ModelPricing:
     unit_costs: Optional[Dict[str, float]] = None
 
 
+#: Shared zero pricing for unknown models
+_ZERO_PRICING = ModelPricing(input_per_1k=0.0, output_per_1k=0.0)
+
+
+def _export_record(entry: Dict[str, Any]) -> Dict[str, Any]:
+    """Materialize an external view of an entry with an ISO timestamp."""
+    ts_ns = entry.get("ts_ns")
+    if ts_ns is None:
+        return entry
+    exported = dict(entry)
+    exported["timestamp"] = (
+        datetime.utcfromtimestamp(exported.pop("ts_ns") / 1e9).isoformat() + "Z"
+    )
+    return exported
+
+
 class PricingRegistry:
     """Resolve model pricing from configuration."""
 
@@ -42,18 +72,34 @@ class PricingRegistry:
         costs = config.get("costs", {})
         self.models = costs.get("models", {})
         self.default_model = costs.get("default_model")
+        # Pricing config is immutable at runtime: resolved ModelPricing
+        # objects are shared per (model, modality, tier)
+        self._cache: Dict[Any, ModelPricing] = {}
+        # Precomputed tier upper bounds per tier list, for bisect lookup
+        self._tier_uppers: Dict[int, List[float]] = {}
 
     def resolve(self, model: str, prompt_tokens: int = 0, modality: str = "text") -> ModelPricing:
         model_config = self.models.get(model)
         if not model_config and self.default_model:
             model_config = self.models.get(self.default_model)
         if not model_config:
-            return ModelPricing(input_per_1k=0.0, output_per_1k=0.0)
+            return _ZERO_PRICING
 
         model_config = self._select_modality(model_config, modality)
-        tier_config = self._select_tier(model_config, prompt_tokens)
-
-        return ModelPricing(
+        tiers = model_config.get("tiers")
+        if tiers:
+            tier_index = self._tier_index(tiers, prompt_tokens)
+            tier_config = tiers[tier_index]
+        else:
+            tier_index = -1
+            tier_config = model_config
+
+        cache_key = (model, modality, tier_index)
+        cached = self._cache.get(cache_key)
+        if cached is not None:
+            return cached
+
+        pricing = ModelPricing(
             input_per_1k=float(tier_config.get("input_per_1k", 0.0)),
             output_per_1k=float(tier_config.get("output_per_1k", 0.0)),
             cached_input_per_1k=_optional_float(tier_config.get("cached_input_per_1k")),
@@ -64,6 +110,8 @@ class PricingRegistry:
             unit_cost=_optional_float(tier_config.get("unit_cost")),
             unit_costs=_optional_costs(tier_config.get("unit_costs")),
         )
+        self._cache[cache_key] = pricing
+        return pricing
 
     def _select_modality(self, config: Dict[str, Any], modality: str) -> Dict[str, Any]:
         modalities = config.get("modalities")
@@ -75,16 +123,20 @@ class PricingRegistry:
             return modalities["text"]
         return next(iter(modalities.values()))
 
-    def _select_tier(self, config: Dict[str, Any], prompt_tokens: int) -> Dict[str, Any]:
-        tiers = config.get("tiers")
-        if not tiers:
-            return config
-        for tier in tiers:
-            min_tokens = tier.get("min_prompt_tokens", 0)
-            max_tokens = tier.get("max_prompt_tokens")
-            if prompt_tokens >= min_tokens and (max_tokens is None or prompt_tokens <= max_tokens):
-                return tier
-        return tiers[-1]
+    def _tier_index(self, tiers: List[Dict[str, Any]], prompt_tokens: int) -> int:
+        # One sorted upper-bound array per tier list, built on first use, so
+        # the per-call lookup is a single bisect instead of a dict-walk loop
+        uppers = self._tier_uppers.get(id(tiers))
+        if uppers is None:
+            uppers = [
+                float("inf") if tier.get("max_prompt_tokens") is None
+                else float(tier["max_prompt_tokens"])
+                for tier in tiers
+            ]
+            self._tier_uppers[id(tiers)] = uppers
+
+        index = bisect_left(uppers, prompt_tokens)
+        return min(index, len(tiers) - 1)
 
 
 def _optional_float(value: Any) -> Optional[float]:
@@ -118,11 +170,49 @@ class CostTracker:
         costs_cfg = config.get("costs", {})
         self.enabled = costs_cfg.get("enabled", True)
         self.max_entries = int(costs_cfg.get("max_entries", 10000))
+        self.record_zero_cost = costs_cfg.get("record_zero_cost", True)
         self.export_path = costs_cfg.get("export_path")
         self.entries: Deque[Dict[str, Any]] = deque(maxlen=self.max_entries)
+        # Parallel timestamp deque (entries are appended in time order) so
+        # time-window queries locate their cutoff by bisection
+        self._timestamps: Deque[int] = deque(maxlen=self.max_entries)
+
+        # Running aggregates over the retained entries, kept in sync on
+        # append/eviction so whole-window summaries are O(1)
+        self._totals = {
+            "cost_usd": 0.0,
+            "prompt_tokens": 0,
+            "completion_tokens": 0,
+            "total_tokens": 0,
+            "count": 0,
+        }
+        self._breakdown = {
+            "workflow": defaultdict(float),
+            "agent": defaultdict(float),
+            "model": defaultdict(float),
+        }
 
+        # Metadata interning: deployments see a few dozen metadata shapes,
+        # so retained entries share one dict per shape instead of N copies
+        self._meta_intern: "OrderedDict[tuple, Dict[str, Any]]" = OrderedDict()
+        self._meta_intern_max = 256
+
+        # Export writes go through one long-lived buffered handle on a
+        # background thread: the request path only pays for a queue put, and
+        # JSON serialization happens off-thread too
+        self._flush_every = int(costs_cfg.get("flush_every", 50))
+        self._export_fh = None
+        self._export_queue: Optional[queue.Queue] = None
         if self.export_path:
             Path(self.export_path).parent.mkdir(parents=True, exist_ok=True)
+            self._export_fh = open(
+                self.export_path, "a", buffering=1 << 16, encoding="utf-8"
+            )
+            self._export_queue = queue.Queue()
+            self._export_thread = threading.Thread(
+                target=self._drain_exports, daemon=True
+            )
+            self._export_thread.start()
 
     def record(
         self,
@@ -135,52 +225,70 @@ class CostTracker:
         if not self.enabled:
             return None
 
-        modality = metadata.get("modality", "text") if metadata else "text"
+        # Read metadata once into locals; the nested get chains otherwise
+        # re-probe the dict on every branch below
+        md = metadata or {}
+        modality = md.get("modality", "text")
         pricing = self.registry.resolve(model, prompt_tokens=prompt_tokens, modality=modality)
-        cached_rate = (
-            pricing.cached_input_per_1k
-            if pricing.cached_input_per_1k is not None
-            else pricing.input_per_1k
-        )
-        cached_tokens = min(metadata.get("cached_tokens", 0), prompt_tokens) if metadata else 0
-        cache_write_tokens = min(
-            metadata.get("cache_write_tokens", 0),
-            max(prompt_tokens - cached_tokens, 0),
-        ) if metadata else 0
-        cache_write_5m_tokens = min(
-            metadata.get("cache_write_5m_tokens", 0),
-            max(prompt_tokens - cached_tokens, 0),
-        ) if metadata else 0
-        cache_write_1h_tokens = min(
-            metadata.get("cache_write_1h_tokens", 0),
-            max(prompt_tokens - cached_tokens, 0),
-        ) if metadata else 0
-
-        billable_prompt = max(
-            prompt_tokens - cached_tokens - cache_write_tokens - cache_write_5m_tokens - cache_write_1h_tokens,
-            0,
+
+        # Unknown models resolve to all-zero pricing: skip the arithmetic
+        # (and optionally the whole entry) instead of multiplying zeros
+        zero_priced = (
+            pricing.input_per_1k == 0.0
+            and pricing.output_per_1k == 0.0
+            and not pricing.unit_cost
+            and not pricing.unit_costs
         )
-        cache_write_rate = pricing.cache_write_per_1k or pricing.input_per_1k
-        cache_write_5m_rate = pricing.cache_write_5m_per_1k or cache_write_rate
-        cache_write_1h_rate = pricing.cache_write_1h_per_1k or cache_write_rate
-        unit_count = metadata.get("unit_count", 0) if metadata else 0
-        unit_tier = metadata.get("unit_tier") if metadata else None
+        if zero_priced and not self.record_zero_cost:
+            return None
+
+        unit_count = md.get("unit_count", 0)
+        unit_tier = md.get("unit_tier")
         unit_cost = pricing.unit_cost
         if pricing.unit_costs and unit_tier in pricing.unit_costs:
             unit_cost = pricing.unit_costs[unit_tier]
-        cost = (
-            (billable_prompt / 1000.0) * pricing.input_per_1k
-            + (cached_tokens / 1000.0) * cached_rate
-            + (cache_write_tokens / 1000.0) * cache_write_rate
-            + (cache_write_5m_tokens / 1000.0) * cache_write_5m_rate
-            + (cache_write_1h_tokens / 1000.0) * cache_write_1h_rate
-            + (completion_tokens / 1000.0) * pricing.output_per_1k
-            + (unit_count * unit_cost if unit_cost and unit_count else 0.0)
-        )
+        unit_term = unit_count * unit_cost if unit_cost and unit_count else 0.0
+
+        cached_tokens = min(md.get("cached_tokens", 0), prompt_tokens)
+        uncached_prompt = max(prompt_tokens - cached_tokens, 0)
+        cache_write_tokens = min(md.get("cache_write_tokens", 0), uncached_prompt)
+        cache_write_5m_tokens = min(md.get("cache_write_5m_tokens", 0), uncached_prompt)
+        cache_write_1h_tokens = min(md.get("cache_write_1h_tokens", 0), uncached_prompt)
+
+        if zero_priced:
+            cost = 0.0
+        elif cached_tokens or cache_write_tokens or cache_write_5m_tokens or cache_write_1h_tokens:
+            cached_rate = (
+                pricing.cached_input_per_1k
+                if pricing.cached_input_per_1k is not None
+                else pricing.input_per_1k
+            )
+            billable_prompt = max(
+                prompt_tokens - cached_tokens - cache_write_tokens - cache_write_5m_tokens - cache_write_1h_tokens,
+                0,
+            )
+            cache_write_rate = pricing.cache_write_per_1k or pricing.input_per_1k
+            cache_write_5m_rate = pricing.cache_write_5m_per_1k or cache_write_rate
+            cache_write_1h_rate = pricing.cache_write_1h_per_1k or cache_write_rate
+            cost = (
+                billable_prompt * pricing.input_per_1k
+                + cached_tokens * cached_rate
+                + cache_write_tokens * cache_write_rate
+                + cache_write_5m_tokens * cache_write_5m_rate
+                + cache_write_1h_tokens * cache_write_1h_rate
+                + completion_tokens * pricing.output_per_1k
+            ) * 0.001 + unit_term
+        else:
+            # Fast path: no cache accounting, two multiplies and one add
+            cost = (
+                prompt_tokens * pricing.input_per_1k
+                + completion_tokens * pricing.output_per_1k
+            ) * 0.001 + unit_term
 
         context = get_context()
         entry = {
-            "timestamp": datetime.utcnow().isoformat() + "Z",
+            # Cheap integer timestamp; ISO formatting is deferred to export
+            "ts_ns": time.time_ns(),
             "workflow": context.get("workflow"),
             "agent": context.get("agent"),
             "request_id": context.get("request_id"),
@@ -193,13 +301,17 @@ class CostTracker:
             "completion_tokens": completion_tokens,
             "total_tokens": total_tokens,
             "cost_usd": round(cost, 8),
-            "metadata": metadata or {},
+            "metadata": self._intern_metadata(md),
         }
 
+        if self.entries.maxlen and len(self.entries) == self.entries.maxlen:
+            self._apply_to_aggregates(self.entries[0], sign=-1)
         self.entries.append(entry)
-        if self.export_path:
-            with open(self.export_path, "a", encoding="utf-8") as handle:
-                handle.write(json.dumps(entry) + "\n")
+        self._timestamps.append(entry["ts_ns"])
+        self._apply_to_aggregates(entry, sign=1)
+
+        if self._export_queue is not None:
+            self._export_queue.put_nowait(entry)
 
         if self.metrics:
             self.metrics.record_cost(
@@ -215,13 +327,90 @@ class CostTracker:
 
         return entry
 
+    def _drain_exports(self) -> None:
+        """Background consumer: serialize and write queued entries in batches."""
+        while True:
+            batch = [self._export_queue.get()]
+            while len(batch) < self._flush_every:
+                try:
+                    batch.append(self._export_queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            try:
+                self._export_fh.write(
+                    "\n".join(_dumps(_export_record(entry)) for entry in batch) + "\n"
+                )
+                self._export_fh.flush()
+            except Exception:  # pragma: no cover - disk unavailable
+                self.logger.exception("Cost export write failed")
+            finally:
+                for _ in batch:
+                    self._export_queue.task_done()
+
+    def flush_exports(self) -> None:
+        """Block until all queued entries have been written."""
+        if self._export_queue is not None:
+            self._export_queue.join()
+
+    def close(self) -> None:
+        """Flush pending exports and release the export handle."""
+        self.flush_exports()
+        if self._export_fh:
+            self._export_fh.close()
+            self._export_fh = None
+
+    def _intern_metadata(self, metadata: Dict[str, Any]) -> Dict[str, Any]:
+        """Return a shared copy of metadata, deduplicated by content."""
+        if not metadata:
+            return {}
+        try:
+            key = tuple(sorted(metadata.items()))
+            shared = self._meta_intern.get(key)
+        except TypeError:
+            # Unhashable values: store a private copy
+            return dict(metadata)
+
+        if shared is None:
+            shared = dict(metadata)
+            self._meta_intern[key] = shared
+            while len(self._meta_intern) > self._meta_intern_max:
+                self._meta_intern.popitem(last=False)
+        else:
+            self._meta_intern.move_to_end(key)
+        return shared
+
+    def _apply_to_aggregates(self, entry: Dict[str, Any], sign: int) -> None:
+        """Add (or subtract, on eviction) one entry to the running aggregates."""
+        self._totals["cost_usd"] += sign * entry["cost_usd"]
+        self._totals["prompt_tokens"] += sign * entry["prompt_tokens"]
+        self._totals["completion_tokens"] += sign * entry["completion_tokens"]
+        self._totals["total_tokens"] += sign * entry["total_tokens"]
+        self._totals["count"] += sign
+
+        for key in ("workflow", "agent", "model"):
+            self._breakdown[key][entry[key] or "unknown"] += sign * entry["cost_usd"]
+
     def summary(self, since_minutes: Optional[int] = None) -> Dict[str, Any]:
-        entries = list(self.entries)
-        if since_minutes is not None:
-            cutoff = datetime.utcnow() - timedelta(minutes=since_minutes)
-            entries = [
-                e for e in entries if datetime.fromisoformat(e["timestamp"].replace("Z", "")) >= cutoff
-            ]
+        if since_minutes is None:
+            # Whole-window summary comes straight from running aggregates
+            return {
+                "totals": {
+                    "cost_usd": round(self._totals["cost_usd"], 6),
+                    "prompt_tokens": self._totals["prompt_tokens"],
+                    "completion_tokens": self._totals["completion_tokens"],
+                    "total_tokens": self._totals["total_tokens"],
+                    "count": self._totals["count"],
+                },
+                "breakdown": {
+                    key: {name: round(value, 6) for name, value in bucket.items()}
+                    for key, bucket in self._breakdown.items()
+                },
+            }
+
+        cutoff_ns = time.time_ns() - since_minutes * 60 * 1_000_000_000
+        start = bisect_left(self._timestamps, cutoff_ns)
+        entries = list(islice(self.entries, start, len(self.entries)))
 
         totals = {
             "cost_usd": round(sum(e["cost_usd"] for e in entries), 6),
@@ -240,16 +429,63 @@ class CostTracker:
         return {"totals": totals, "breakdown": breakdown}
 
     def recent(self, limit: int = 100) -> List[Dict[str, Any]]:
-        entries = list(self.entries)
-        return entries[-limit:]
+        # islice the tail instead of copying the whole deque
+        stored = len(self.entries)
+        return [
+            _export_record(e)
+            for e in islice(self.entries, max(0, stored - limit), stored)
+        ]
+
+
+def _parse_openai_usage(usage: Dict[str, Any]) -> tuple:
+    """Straight-line reads for the OpenAI token_usage shape."""
+    prompt_tokens = int(usage.get("prompt_tokens") or 0)
+    completion_tokens = int(usage.get("completion_tokens") or 0)
+    total_tokens = int(usage.get("total_tokens") or prompt_tokens + completion_tokens)
+
+    details = usage.get("prompt_tokens_details")
+    cached_tokens = (
+        int(details.get("cached_tokens") or 0) if isinstance(details, dict) else 0
+    )
+    cached_tokens = int(usage.get("cached_tokens") or cached_tokens)
+    return prompt_tokens, completion_tokens, total_tokens, cached_tokens
+
+
+def _parse_generic_usage(usage: Dict[str, Any]) -> tuple:
+    """Fallback parser covering alternate provider field names."""
+    prompt_tokens = int(usage.get("prompt_tokens") or usage.get("input_tokens") or 0)
+    completion_tokens = int(
+        usage.get("completion_tokens") or usage.get("output_tokens") or 0
+    )
+    total_tokens = int(usage.get("total_tokens") or prompt_tokens + completion_tokens)
+
+    cached_tokens = 0
+    details = usage.get("prompt_tokens_details") or usage.get("input_tokens_details") or {}
+    if isinstance(details, dict):
+        cached_tokens = int(details.get("cached_tokens") or details.get("cache_read_tokens") or 0)
+    cached_tokens = int(usage.get("cached_tokens") or cached_tokens)
+    return prompt_tokens, completion_tokens, total_tokens, cached_tokens
+
+
+_USAGE_PARSERS = {
+    "openai": _parse_openai_usage,
+}
 
 
 class CostTrackingCallbackHandler(BaseCallbackHandler):
     """LangChain callback handler for cost tracking."""
 
-    def __init__(self, tracker: CostTracker, model_name: Optional[str] = None):
+    def __init__(
+        self,
+        tracker: CostTracker,
+        model_name: Optional[str] = None,
+        provider: str = "openai",
+    ):
         self.tracker = tracker
         self.model_name = model_name
+        self.provider = provider
+        # Bind the usage parser once: no fallback chains on the hot path
+        self._parse = _USAGE_PARSERS.get(provider, _parse_generic_usage)
 
     def on_llm_end(self, response: LLMResult, **kwargs: Any) -> None:
         if not self.tracker:
@@ -259,16 +495,7 @@ class CostTrackingCallbackHandler(BaseCallbackHandler):
         if not usage:
             return
 
-        prompt_tokens = int(usage.get("prompt_tokens") or usage.get("input_tokens") or 0)
-        completion_tokens = int(
-            usage.get("completion_tokens") or usage.get("output_tokens") or 0
-        )
-        total_tokens = int(usage.get("total_tokens") or prompt_tokens + completion_tokens)
-        cached_tokens = 0
-        details = usage.get("prompt_tokens_details") or usage.get("input_tokens_details") or {}
-        if isinstance(details, dict):
-            cached_tokens = int(details.get("cached_tokens") or details.get("cache_read_tokens") or 0)
-        cached_tokens = int(usage.get("cached_tokens") or cached_tokens)
+        prompt_tokens, completion_tokens, total_tokens, cached_tokens = self._parse(usage)
         model = (
             llm_output.get("model_name")
             or llm_output.get("model")
@@ -281,5 +508,5 @@ class CostTrackingCallbackHandler(BaseCallbackHandler):
             prompt_tokens=prompt_tokens,
             completion_tokens=completion_tokens,
             total_tokens=total_tokens,
-            metadata={"provider": "openai", "cached_tokens": cached_tokens},
+            metadata={"provider": self.provider, "cached_tokens": cached_tokens},
         )
@@ -0,0 +1,110 @@
+"""Exact-match cache with an in-memory LRU tier over a SQLite disk tier."""
+
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+
+class ExactCache:
+    """
+    Deterministic result cache keyed by content hash.
+
+    The memory tier is a bounded LRU dict; the disk tier is a SQLite table
+    in WAL mode so cached results survive restarts. Lookups never raise:
+    a broken disk tier degrades to memory-only behavior.
+    """
+
+    def __init__(self, config: Dict[str, Any]):
+        self.enabled = config.get("enabled", False)
+        self.maxsize = config.get("maxsize", 10_000)
+        self.path = config.get("path", "storage/exact_cache.db")
+        self._memory: "OrderedDict[bytes, Any]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._conn = None
+
+        if self.enabled:
+            try:
+                Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+                self._conn = sqlite3.connect(self.path, check_same_thread=False)
+                self._conn.execute("PRAGMA journal_mode=WAL")
+                self._conn.execute(
+                    "CREATE TABLE IF NOT EXISTS analyses ("
+                    "content_hash BLOB PRIMARY KEY, payload BLOB, ts INT)"
+                )
+                self._conn.commit()
+            except Exception:  # pragma: no cover - disk tier unavailable
+                self._conn = None
+
+    @staticmethod
+    def content_key(obj: Any) -> bytes:
+        """Build a stable content hash for any JSON-serializable object."""
+        payload = json.dumps(obj, sort_keys=True, default=str, separators=(",", ":"))
+        return hashlib.blake2b(payload.encode("utf-8")).digest()
+
+    def get(self, key: bytes) -> Optional[Any]:
+        """Look up a cached value, promoting disk hits into memory."""
+        if not self.enabled:
+            return None
+
+        with self._lock:
+            value = self._memory.get(key)
+            if value is not None:
+                self._memory.move_to_end(key)
+                return value
+
+        if self._conn is None:
+            return None
+
+        try:
+            with self._lock:
+                row = self._conn.execute(
+                    "SELECT payload FROM analyses WHERE content_hash = ?", (key,)
+                ).fetchone()
+        except Exception:  # pragma: no cover - disk tier unavailable
+            return None
+
+        if row is None:
+            return None
+
+        value = json.loads(row[0])
+        self._remember(key, value)
+        return value
+
+    def put(self, key: bytes, value: Any) -> None:
+        """Store a value in both tiers."""
+        if not self.enabled:
+            return
+
+        self._remember(key, value)
+
+        if self._conn is None:
+            return
+
+        try:
+            with self._lock:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO analyses (content_hash, payload, ts) "
+                    "VALUES (?, ?, ?)",
+                    (key, json.dumps(value, default=str), int(time.time())),
+                )
+                self._conn.commit()
+        except Exception:  # pragma: no cover - disk tier unavailable
+            pass
+
+    def _remember(self, key: bytes, value: Any) -> None:
+        """Insert into the memory tier with LRU eviction."""
+        with self._lock:
+            self._memory[key] = value
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.maxsize:
+                self._memory.popitem(last=False)
+
+    def close(self) -> None:
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
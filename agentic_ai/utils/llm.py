@@ -1,5 +1,6 @@
 """LLM factory utilities."""
 
+from functools import lru_cache
 from typing import Any, Dict, Optional
 from langchain.chat_models import ChatOpenAI
 
@@ -7,12 +8,59 @@ from .config import resolve_agent_config
 from .costs import CostTrackingCallbackHandler
 
 
+@lru_cache(maxsize=32)
+def _get_chat_llm(
+    model: str,
+    temperature: float,
+    max_tokens: int,
+    request_timeout: int,
+    max_retries: int,
+    api_key: Optional[str],
+    tracker: Optional[Any],
+) -> ChatOpenAI:
+    """Return a shared ChatOpenAI client for identical settings.
+
+    ChatOpenAI owns an httpx connection pool, so agents with the same
+    configuration reuse one pool instead of opening one per instance.
+    """
+    callbacks = None
+    if tracker:
+        callbacks = [CostTrackingCallbackHandler(tracker, model_name=model)]
+
+    return ChatOpenAI(
+        model=model,
+        temperature=temperature,
+        max_tokens=max_tokens,
+        request_timeout=request_timeout,
+        max_retries=max_retries,
+        api_key=api_key,
+        callbacks=callbacks,
+    )
+
+
+@lru_cache(maxsize=8)
+def _get_embeddings(api_key: Optional[str]):
+    """Return a shared OpenAIEmbeddings client per API key."""
+    from langchain.embeddings import OpenAIEmbeddings
+
+    return OpenAIEmbeddings(api_key=api_key)
+
+
+def build_embeddings(config: Dict[str, Any]):
+    """Create or reuse an embeddings client for semantic caching."""
+    api_key = (
+        config.get("secrets", {}).get("openai_api_key")
+        or config.get("openai_api_key")
+    )
+    return _get_embeddings(api_key)
+
+
 def build_chat_llm(
     config: Dict[str, Any],
     agent_key: str,
     default_temperature: Optional[float] = None,
 ) -> ChatOpenAI:
-    """Create a configured ChatOpenAI instance."""
+    """Create or reuse a configured ChatOpenAI instance."""
     resolved = resolve_agent_config(config, agent_key)
     temperature = resolved.get("temperature")
     if temperature is None:
@@ -28,18 +76,15 @@ def build_chat_llm(
     request_timeout = resolved.get("request_timeout") or 30
     max_retries = resolved.get("max_retries") or 2
 
-    callbacks = []
     runtime = config.get("runtime", {})
     tracker = runtime.get("cost_tracker") if isinstance(runtime, dict) else None
-    if tracker:
-        callbacks.append(CostTrackingCallbackHandler(tracker, model_name=model))
 
-    return ChatOpenAI(
-        model=model,
-        temperature=temperature,
-        max_tokens=max_tokens,
-        request_timeout=request_timeout,
-        max_retries=max_retries,
-        api_key=resolved.get("openai_api_key"),
-        callbacks=callbacks or None,
+    return _get_chat_llm(
+        model,
+        temperature,
+        max_tokens,
+        request_timeout,
+        max_retries,
+        resolved.get("openai_api_key"),
+        tracker,
     )
@@ -5,11 +5,27 @@ import sys
 import json
 from typing import Optional, Dict, Any
 
+try:
+    import orjson
+
+    def _dumps(payload: Dict[str, Any]) -> str:
+        return orjson.dumps(payload).decode()
+except ImportError:  # pragma: no cover - optional dependency
+    _dumps = json.dumps
+
 
 class JsonFormatter(logging.Formatter):
-    """Simple JSON log formatter."""
+    """Simple JSON log formatter.
+
+    The serialized line is memoized on the record so a record emitted
+    through several handlers (stdout + file) is only formatted once.
+    """
 
     def format(self, record: logging.LogRecord) -> str:
+        cached = getattr(record, "_cached_json", None)
+        if cached is not None:
+            return cached
+
         payload = {
             "timestamp": self.formatTime(record, datefmt="%Y-%m-%dT%H:%M:%S%z"),
             "level": record.levelname,
@@ -18,7 +34,10 @@ class JsonFormatter(logging.Formatter):
         }
         if record.exc_info:
             payload["exc_info"] = self.formatException(record.exc_info)
-        return json.dumps(payload)
+
+        formatted = _dumps(payload)
+        record._cached_json = formatted
+        return formatted
 
 
 def setup_logging(level: str = "INFO", config: Optional[Dict[str, Any]] = None) -> None:
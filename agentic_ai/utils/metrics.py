@@ -25,6 +25,22 @@ except Exception:  # pragma: no cover - optional dependency fallback
     Counter = Histogram = Gauge = _NoopMetric
 
 
+_shared_collector = None
+
+
+def get_metrics_collector() -> "MetricsCollector":
+    """Return the process-wide MetricsCollector.
+
+    Prometheus counters register globally, so constructing a second
+    collector would raise on duplicate timeseries registration; all
+    consumers share this one instance instead.
+    """
+    global _shared_collector
+    if _shared_collector is None:
+        _shared_collector = MetricsCollector()
+    return _shared_collector
+
+
 class MetricsCollector:
     """
     Collect and export metrics for monitoring.
@@ -69,6 +85,10 @@ class MetricsCollector:
             ["workflow", "agent", "model", "token_type"]
         )
 
+        # Pre-labelled metric children per (workflow, agent, model): each
+        # .labels() call is a lock + dict probe inside the Prometheus client
+        self._cost_children: Dict[Any, Any] = {}
+
     def record_request(self, workflow: str, status: str) -> None:
         """Record a request."""
         self.request_counter.labels(workflow=workflow, status=status).inc()
@@ -101,17 +121,30 @@ class MetricsCollector:
         cost_usd: float,
     ) -> None:
         """Record token usage and cost."""
-        self.cost_total.labels(workflow=workflow, agent=agent, model=model).inc(cost_usd)
-        self.tokens_total.labels(
-            workflow=workflow, agent=agent, model=model, token_type="prompt"
-        ).inc(prompt_tokens)
-        self.tokens_total.labels(
-            workflow=workflow, agent=agent, model=model, token_type="completion"
-        ).inc(completion_tokens)
-        self.tokens_total.labels(
-            workflow=workflow, agent=agent, model=model, token_type="total"
-        ).inc(total_tokens)
+        key = (workflow, agent, model)
+        children = self._cost_children.get(key)
+        if children is None:
+            children = (
+                self.cost_total.labels(workflow=workflow, agent=agent, model=model),
+                self.tokens_total.labels(
+                    workflow=workflow, agent=agent, model=model, token_type="prompt"
+                ),
+                self.tokens_total.labels(
+                    workflow=workflow, agent=agent, model=model, token_type="completion"
+                ),
+                self.tokens_total.labels(
+                    workflow=workflow, agent=agent, model=model, token_type="total"
+                ),
+                self.tokens_total.labels(
+                    workflow=workflow, agent=agent, model=model, token_type="cached"
+                ),
+            )
+            self._cost_children[key] = children
+
+        cost_child, prompt_child, completion_child, total_child, cached_child = children
+        cost_child.inc(cost_usd)
+        prompt_child.inc(prompt_tokens)
+        completion_child.inc(completion_tokens)
+        total_child.inc(total_tokens)
         if cached_tokens:
-            self.tokens_total.labels(
-                workflow=workflow, agent=agent, model=model, token_type="cached"
-            ).inc(cached_tokens)
+            cached_child.inc(cached_tokens)
@@ -0,0 +1,68 @@
+"""Token-aware prompt trimming utilities."""
+
+import json
+from typing import Any, Callable, Optional
+
+
+def estimate_tokens(text: str) -> int:
+    """Cheap token estimate (~4 characters per token for English text)."""
+    return max(1, len(text) // 4)
+
+
+def trim(
+    obj: Any,
+    max_tokens: int,
+    counter: Optional[Callable[[str], int]] = None,
+    *,
+    top_k: int = 10,
+    max_str_len: int = 500,
+) -> Any:
+    """
+    Recursively prune an object so its compact JSON fits a token budget.
+
+    Strings are capped, dicts keep only their top-K entries by value, and
+    lists are truncated. The prune is tightened geometrically until the
+    serialized payload fits max_tokens.
+
+    Args:
+        obj: Object to prune
+        max_tokens: Token budget for the serialized payload
+        counter: Token counting function; defaults to a character estimate
+        top_k: Maximum dict/list entries to keep per level
+        max_str_len: Maximum length for string values
+
+    Returns:
+        Pruned copy of the object
+    """
+    counter = counter or estimate_tokens
+
+    pruned = _prune(obj, top_k, max_str_len)
+    payload = json.dumps(pruned, separators=(",", ":"), default=str)
+
+    while counter(payload) > max_tokens and (top_k > 1 or max_str_len > 32):
+        top_k = max(1, top_k // 2)
+        max_str_len = max(32, max_str_len // 2)
+        pruned = _prune(obj, top_k, max_str_len)
+        payload = json.dumps(pruned, separators=(",", ":"), default=str)
+
+    return pruned
+
+
+def _prune(obj: Any, top_k: int, max_str_len: int) -> Any:
+    """Apply one prune pass with the given limits."""
+    if isinstance(obj, str):
+        return obj[:max_str_len]
+
+    if isinstance(obj, dict):
+        items = list(obj.items())
+        if len(items) > top_k:
+            try:
+                items = sorted(items, key=lambda kv: kv[1], reverse=True)[:top_k]
+            except TypeError:
+                items = items[:top_k]
+        return {k: _prune(v, top_k, max_str_len) for k, v in items}
+
+    if isinstance(obj, (list, tuple)):
+        return [_prune(v, top_k, max_str_len) for v in obj[:top_k]]
+
+    return obj
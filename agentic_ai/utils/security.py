@@ -1,10 +1,15 @@
 """Security utilities."""
 
-import asyncio
 import time
+from collections import OrderedDict
 from dataclasses import dataclass
 from typing import Any, Dict, Optional
 
+try:
+    import redis.asyncio as redis
+except Exception:  # pragma: no cover - optional dependency
+    redis = None
+
 
 class APIKeyAuth:
     """API key validation helper."""
@@ -13,6 +18,8 @@ class APIKeyAuth:
         self.enabled = config.get("api_key_required", False)
         self.api_key = config.get("api_key")
         self.header = config.get("api_key_header", "X-API-Key")
+        # Lowercased bytes form for direct ASGI scope header scans
+        self.header_bytes = self.header.lower().encode("latin-1")
 
     def validate(self, supplied_key: Optional[str]) -> bool:
         if not self.enabled:
@@ -27,29 +34,67 @@ class TokenBucket:
 
 
 class RateLimiter:
-    """Token bucket rate limiter per key."""
+    """
+    Rate limiter per key.
+
+    When a Redis URL is configured the limit is enforced with an atomic
+    fixed-window INCR+EXPIRE Lua script, so it is shared across workers and
+    survives restarts. Otherwise (or when Redis is unreachable) it falls
+    back to the in-process token bucket.
+    """
+
+    _WINDOW_LUA = (
+        "local n = redis.call('INCR', KEYS[1]) "
+        "if n == 1 then redis.call('EXPIRE', KEYS[1], 60) end "
+        "return n"
+    )
 
-    def __init__(self, requests_per_minute: int):
+    def __init__(
+        self,
+        requests_per_minute: int,
+        redis_url: Optional[str] = None,
+        max_keys: int = 100_000,
+    ):
         self.capacity = max(1, requests_per_minute)
         self.refill_rate = self.capacity / 60.0
-        self.buckets: Dict[str, TokenBucket] = {}
-        self.lock = asyncio.Lock()
+        # LRU-bounded: unique client keys must not grow without limit
+        self.max_keys = max_keys
+        self.buckets: "OrderedDict[str, TokenBucket]" = OrderedDict()
+
+        self._redis = None
+        self._script = None
+        if redis_url and redis:
+            self._redis = redis.from_url(redis_url, decode_responses=True)
+            self._script = self._redis.register_script(self._WINDOW_LUA)
 
     async def allow(self, key: str) -> bool:
+        if self._script:
+            try:
+                window = int(time.time() // 60)
+                count = await self._script(keys=[f"rl:{key}:{window}"])
+                return int(count) <= self.capacity
+            except Exception:  # pragma: no cover - Redis unavailable
+                pass
+
+        # No lock: the critical section below never awaits, so under
+        # asyncio's single-threaded cooperative model it cannot interleave.
+        # (Multi-worker deployments share state through the Redis path.)
         now = time.monotonic()
-        async with self.lock:
-            bucket = self.buckets.get(key)
-            if not bucket:
-                self.buckets[key] = TokenBucket(tokens=self.capacity - 1, last_refill=now)
-                return True
-
-            elapsed = now - bucket.last_refill
-            new_tokens = min(self.capacity, bucket.tokens + elapsed * self.refill_rate)
-            if new_tokens < 1:
-                bucket.tokens = new_tokens
-                bucket.last_refill = now
-                return False
-
-            bucket.tokens = new_tokens - 1
-            bucket.last_refill = now
+        bucket = self.buckets.get(key)
+        if not bucket:
+            self.buckets[key] = TokenBucket(tokens=self.capacity - 1, last_refill=now)
+            while len(self.buckets) > self.max_keys:
+                self.buckets.popitem(last=False)
             return True
+
+        self.buckets.move_to_end(key)
+        elapsed = now - bucket.last_refill
+        new_tokens = min(self.capacity, bucket.tokens + elapsed * self.refill_rate)
+        if new_tokens < 1:
+            bucket.tokens = new_tokens
+            bucket.last_refill = now
+            return False
+
+        bucket.tokens = new_tokens - 1
+        bucket.last_refill = now
+        return True
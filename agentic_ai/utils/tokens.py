@@ -0,0 +1,55 @@
+"""Token counting utilities with a cached tiktoken encoder."""
+
+from functools import lru_cache
+
+from .prompt_trim import estimate_tokens
+
+try:
+    import tiktoken
+except Exception:  # pragma: no cover - optional dependency
+    tiktoken = None
+
+
+@lru_cache(maxsize=8)
+def _get_encoding(model: str):
+    """Build the tiktoken encoding for a model once per process.
+
+    Returns None when no encoding can be loaded (unknown model and no
+    network access to fetch the BPE data), in which case callers fall back
+    to the character estimate.
+    """
+    try:
+        return tiktoken.encoding_for_model(model)
+    except KeyError:
+        pass
+    except Exception:  # pragma: no cover - BPE download unavailable
+        return None
+    try:
+        return tiktoken.get_encoding("cl100k_base")
+    except Exception:  # pragma: no cover - BPE download unavailable
+        return None
+
+
+class TokenCounter:
+    """
+    Token counter bound to one model's encoding.
+
+    The encoder is expensive to construct, so it is cached per model and
+    shared across counters; counting itself is a single encode call.
+    """
+
+    def __init__(self, model: str = "gpt-4o-mini"):
+        self.model = model
+
+    def count(self, text: str) -> int:
+        """Count tokens in text, falling back to a character estimate."""
+        if tiktoken is None:
+            return estimate_tokens(text)
+        encoding = _get_encoding(self.model)
+        if encoding is None:
+            return estimate_tokens(text)
+        return len(encoding.encode(text))
+
+
+#: Shared default counter for prompt budgeting
+COUNTER = TokenCounter()
@@ -6,12 +6,15 @@ LangGraph-based assembly line architecture for orchestrating multiple agents
 in a sequential or parallel processing pipeline.
 """
 
-from typing import Dict, Any, List, Optional, Callable
-from langgraph.graph import Graph, StateGraph, END
-from langgraph.prebuilt import ToolExecutor
+import operator
+from typing import Annotated, Dict, Any, List, Optional, Callable, TypedDict
+from langgraph.graph import StateGraph, END
 from datetime import datetime
 import asyncio
 import logging
+import time
+from collections import deque
+from itertools import islice
 
 from ..agents.base_agent import BaseAgent, AgentState
 from ..utils.context import (
@@ -24,6 +27,17 @@ from ..utils.context import (
 )
 
 
+class PipelineState(TypedDict, total=False):
+    """Graph state schema: list fields merge via reducers, so nodes return
+    only their delta instead of mutating a shared dict."""
+
+    data: Dict[str, Any]
+    metadata: Dict[str, Any]
+    errors: Annotated[List[str], operator.add]
+    agent_results: Annotated[List[Dict[str, Any]], operator.add]
+    pipeline_id: str
+
+
 class AssemblyLinePipeline:
     """
     Assembly line pipeline for orchestrating multiple agents using LangGraph.
@@ -44,13 +58,19 @@ class AssemblyLinePipeline:
         # Agent registry
         self.agents: Dict[str, BaseAgent] = {}
         self.agent_order: List[str] = []
+        # Explicit dependencies per agent; by default each agent depends on
+        # the previously added one, preserving the sequential assembly line
+        self.dependencies: Dict[str, List[str]] = {}
 
         # Graph for orchestration
         self.graph: Optional[StateGraph] = None
         self.compiled_graph = None
 
-        # Execution history
-        self.execution_history: List[Dict[str, Any]] = []
+        # Execution history: bounded ring with running aggregates so
+        # metrics reads are O(1)
+        history_size = self.config.get("workflows", {}).get("history_size", 1000)
+        self.execution_history: deque = deque(maxlen=history_size)
+        self._history_agg = {"total": 0, "ok": 0, "time_sum": 0.0, "errors": 0}
 
     def add_agent(
         self,
@@ -62,13 +82,19 @@ class AssemblyLinePipeline:
 
         Args:
             agent: Agent instance
-            dependencies: List of agent names this agent depends on
+            dependencies: List of agent names this agent depends on. When
+                omitted, the agent depends on the previously added one;
+                agents given disjoint dependencies run concurrently.
 
         Returns:
             Self for method chaining
         """
+        if dependencies is None:
+            dependencies = self.agent_order[-1:]
+
         self.agents[agent.name] = agent
         self.agent_order.append(agent.name)
+        self.dependencies[agent.name] = [d for d in dependencies if d in self.agents]
 
         self.logger.info(f"Added agent: {agent.name}")
 
@@ -84,30 +110,139 @@ class AssemblyLinePipeline:
         self.logger.info(f"Building pipeline: {self.name}")
 
         # Create state graph
-        self.graph = StateGraph(dict)
-
-        # Add nodes for each agent
-        for agent_name in self.agent_order:
-            self.graph.add_node(agent_name, self._create_agent_node(agent_name))
+        self.graph = StateGraph(PipelineState)
+
+        # Resolve dependency layers; agents within a layer have no mutual
+        # dependency and run concurrently inside one graph node, so their
+        # I/O-bound LLM calls overlap
+        layers = self._topological_layers()
+
+        node_names = []
+        for layer in layers:
+            if len(layer) == 1:
+                name = layer[0]
+                self.graph.add_node(name, self._create_agent_node(name))
+            else:
+                name = "+".join(layer)
+                self.graph.add_node(name, self._create_layer_node(layer))
+            node_names.append(name)
 
-        # Add edges (sequential flow)
-        for i in range(len(self.agent_order) - 1):
-            current = self.agent_order[i]
-            next_agent = self.agent_order[i + 1]
-            self.graph.add_edge(current, next_agent)
+        # Add edges (sequential flow between layers)
+        for i in range(len(node_names) - 1):
+            self.graph.add_edge(node_names[i], node_names[i + 1])
 
         # Set entry and exit points
-        if self.agent_order:
-            self.graph.set_entry_point(self.agent_order[0])
-            self.graph.add_edge(self.agent_order[-1], END)
+        if node_names:
+            self.graph.set_entry_point(node_names[0])
+            self.graph.add_edge(node_names[-1], END)
 
         # Compile the graph
         self.compiled_graph = self.graph.compile()
 
+        # Resolve the execute timeout once instead of per request
+        workflows_cfg = self.config.get("workflows", {})
+        key = self.name.replace("Workflow", "").lower()
+        self._timeout = (workflows_cfg.get(key) or {}).get("timeout")
+
         self.logger.info(f"Pipeline built with {len(self.agents)} agents")
 
         return self
 
+    def _topological_layers(self) -> List[List[str]]:
+        """
+        Group agents into dependency layers (Kahn's algorithm).
+
+        Agents in the same layer have all their dependencies satisfied by
+        earlier layers and none on each other. Layer members keep the order
+        in which they were added.
+
+        Returns:
+            List of layers, each a list of agent names
+        """
+        remaining = list(self.agent_order)
+        satisfied: set = set()
+        layers: List[List[str]] = []
+
+        while remaining:
+            layer = [
+                name
+                for name in remaining
+                if all(dep in satisfied for dep in self.dependencies.get(name, []))
+            ]
+            if not layer:
+                # Cyclic or dangling dependencies: fall back to added order
+                self.logger.warning("Unresolvable agent dependencies; running sequentially")
+                layers.extend([name] for name in remaining)
+                break
+
+            layers.append(layer)
+            satisfied.update(layer)
+            remaining = [name for name in remaining if name not in satisfied]
+
+        return layers
+
+    def _create_layer_node(self, agent_names: List[str]) -> Callable:
+        """
+        Create a node that runs several independent agents concurrently.
+
+        Args:
+            agent_names: Agents with no mutual dependencies
+
+        Returns:
+            Node function
+        """
+        async def layer_node(state: PipelineState) -> Dict[str, Any]:
+            """Run the layer's agents concurrently and merge their deltas."""
+
+            async def run(agent_name: str):
+                agent = self.agents[agent_name]
+                start_time = datetime.now()
+                start_ns = time.perf_counter_ns()
+                agent_token = set_agent(agent_name)
+                try:
+                    agent_state = AgentState(
+                        agent_name=agent_name,
+                        timestamp=start_time,
+                        data=dict(state.get("data", {})),
+                        metadata=dict(state.get("metadata", {})),
+                        errors=[]
+                    )
+                    result_state = await agent.process(agent_state)
+                    processing_time = (time.perf_counter_ns() - start_ns) / 1e9
+                    return agent_name, result_state, processing_time
+                finally:
+                    reset_agent(agent_token)
+
+            self.logger.info("Executing agent layer: %s", ", ".join(agent_names))
+            results = await asyncio.gather(*(run(name) for name in agent_names))
+
+            data = dict(state.get("data", {}))
+            metadata = dict(state.get("metadata", {}))
+            errors: List[str] = []
+            records = []
+
+            for agent_name, result_state, processing_time in results:
+                data.update(result_state.data)
+                metadata.update(result_state.metadata)
+                errors.extend(result_state.errors)
+
+                records.append({
+                    "agent": agent_name,
+                    "success": len(result_state.errors) == 0,
+                    "processing_time": processing_time,
+                    "timestamp": result_state.timestamp.isoformat(),
+                    "errors": result_state.errors
+                })
+
+            return {
+                "data": data,
+                "metadata": metadata,
+                "errors": errors,
+                "agent_results": records,
+            }
+
+        return layer_node
+
     def _create_agent_node(self, agent_name: str) -> Callable:
         """
         Create a node function for an agent.
@@ -118,52 +253,48 @@ class AssemblyLinePipeline:
         Returns:
             Node function
         """
-        async def node_function(state: Dict[str, Any]) -> Dict[str, Any]:
-            """Execute agent and update state."""
+        async def node_function(state: PipelineState) -> Dict[str, Any]:
+            """Execute agent and return its state delta."""
             agent = self.agents[agent_name]
 
-            self.logger.info(f"Executing agent: {agent_name}")
+            self.logger.info("Executing agent: %s", agent_name)
             start_time = datetime.now()
+            start_ns = time.perf_counter_ns()
             agent_token = set_agent(agent_name)
 
             try:
-                # Create agent state
+                # Create agent state; errors start empty so the node's delta
+                # only carries this agent's errors for the reducer to merge
                 agent_state = AgentState(
                     agent_name=agent_name,
                     timestamp=start_time,
                     data=state.get("data", {}),
                     metadata=state.get("metadata", {}),
-                    errors=state.get("errors", [])
+                    errors=[]
                 )
 
                 # Process through agent
                 result_state = await agent.process(agent_state)
 
-                # Calculate processing time
-                processing_time = (datetime.now() - start_time).total_seconds()
-
-                # Update state
-                state["data"] = result_state.data
-                state["metadata"] = result_state.metadata
-                state["errors"] = result_state.errors
-
-                # Track agent execution
-                if "agent_results" not in state:
-                    state["agent_results"] = []
-
-                state["agent_results"].append({
-                    "agent": agent_name,
-                    "success": len(result_state.errors) == 0,
-                    "processing_time": processing_time,
-                    "timestamp": result_state.timestamp.isoformat(),
-                    "errors": result_state.errors
-                })
+                # Calculate processing time (monotonic, no timedelta objects)
+                processing_time = (time.perf_counter_ns() - start_ns) / 1e9
 
                 self.logger.info(
-                    f"Agent {agent_name} completed in {processing_time:.2f}s"
+                    "Agent %s completed in %.2fs", agent_name, processing_time
                 )
 
-                return state
+                return {
+                    "data": result_state.data,
+                    "metadata": result_state.metadata,
+                    "errors": result_state.errors,
+                    "agent_results": [{
+                        "agent": agent_name,
+                        "success": len(result_state.errors) == 0,
+                        "processing_time": processing_time,
+                        "timestamp": result_state.timestamp.isoformat(),
+                        "errors": result_state.errors
+                    }],
+                }
             finally:
                 reset_agent(agent_token)
 
@@ -189,13 +320,13 @@ class AssemblyLinePipeline:
 
         self.logger.info(f"Starting pipeline execution: {self.name}")
         start_time = datetime.now()
+        start_ns = time.perf_counter_ns()
 
-        # Create initial state
+        # Create initial state: errors/agent_results are reducer-managed
+        # channels, so only the dynamic fields need allocating per request
         initial_state = {
             "data": input_data,
             "metadata": metadata or {},
-            "errors": [],
-            "agent_results": [],
             "pipeline_id": f"{self.name}_{start_time.timestamp()}"
         }
         workflow_token = set_workflow(self.name)
@@ -203,7 +334,7 @@ class AssemblyLinePipeline:
 
         try:
             # Execute the graph with optional timeout
-            timeout = self._get_timeout()
+            timeout = self._timeout
             if timeout:
                 final_state = await asyncio.wait_for(
                     self.compiled_graph.ainvoke(initial_state),
@@ -213,7 +344,7 @@ class AssemblyLinePipeline:
                 final_state = await self.compiled_graph.ainvoke(initial_state)
 
             # Calculate total time
-            total_time = (datetime.now() - start_time).total_seconds()
+            total_time = (time.perf_counter_ns() - start_ns) / 1e9
 
             # Prepare result
             result = {
@@ -228,7 +359,7 @@ class AssemblyLinePipeline:
             }
 
             # Store in history
-            self.execution_history.append(result)
+            self._record_history(result)
 
             self.logger.info(
                 f"Pipeline completed successfully in {total_time:.2f}s"
@@ -246,24 +377,23 @@ class AssemblyLinePipeline:
                 "errors": [str(e)],
                 "agent_results": [],
                 "pipeline_id": initial_state["pipeline_id"],
-                "total_time": (datetime.now() - start_time).total_seconds(),
+                "total_time": (time.perf_counter_ns() - start_ns) / 1e9,
                 "timestamp": datetime.now().isoformat()
             }
         finally:
             reset_workflow(workflow_token)
             reset_request_id(request_token)
 
-    def _get_timeout(self) -> Optional[int]:
-        workflows_cfg = self.config.get("workflows", {})
-        key = self.name.replace("Workflow", "").lower()
-        return workflows_cfg.get(key, {}).get("timeout")
-
     async def execute_batch(
         self,
         batch_input: List[Dict[str, Any]]
     ) -> List[Dict[str, Any]]:
         """
-        Execute pipeline for multiple inputs in parallel.
+        Execute pipeline for multiple inputs, batched per stage.
+
+        Instead of N independent graph invocations, the whole batch advances
+        through the agents one stage at a time via process_batch, so each
+        agent can coalesce its LLM calls across items.
 
         Args:
             batch_input: List of input data dictionaries
@@ -272,15 +402,83 @@ class AssemblyLinePipeline:
             List of results
         """
         self.logger.info(f"Executing batch of {len(batch_input)} items")
+        start_time = datetime.now()
+        start_ns = time.perf_counter_ns()
+        pipeline_id = f"{self.name}_batch_{start_time.timestamp()}"
+
+        states = [
+            AgentState(
+                agent_name=self.name,
+                timestamp=start_time,
+                data=dict(input_data),
+                metadata={},
+                errors=[]
+            )
+            for input_data in batch_input
+        ]
+        agent_results: List[List[Dict[str, Any]]] = [[] for _ in batch_input]
 
-        tasks = [self.execute(input_data) for input_data in batch_input]
-        results = await asyncio.gather(*tasks, return_exceptions=True)
+        for agent_name in self.agent_order:
+            agent = self.agents[agent_name]
+            stage_start_iso = datetime.now().isoformat()
+            stage_start_ns = time.perf_counter_ns()
+            agent_token = set_agent(agent_name)
+
+            try:
+                states = await agent.process_batch(states)
+            except Exception as e:
+                self.logger.error(f"Batch stage {agent_name} failed: {str(e)}")
+                for state in states:
+                    state.add_error(str(e))
+                break
+            finally:
+                reset_agent(agent_token)
+
+            stage_time = (time.perf_counter_ns() - stage_start_ns) / 1e9
+            for per_item, state in zip(agent_results, states):
+                per_item.append({
+                    "agent": agent_name,
+                    "success": len(state.errors) == 0,
+                    "processing_time": stage_time,
+                    "timestamp": stage_start_iso,
+                    "errors": list(state.errors)
+                })
+
+        total_time = (time.perf_counter_ns() - start_ns) / 1e9
+        finished = datetime.now().isoformat()
 
         return [
-            r if not isinstance(r, Exception) else {"success": False, "error": str(r)}
-            for r in results
+            {
+                "success": len(state.errors) == 0,
+                "data": state.data,
+                "metadata": state.metadata,
+                "errors": state.errors,
+                "agent_results": per_item,
+                "pipeline_id": pipeline_id,
+                "total_time": total_time,
+                "timestamp": finished
+            }
+            for state, per_item in zip(states, agent_results)
         ]
 
+    def _record_history(self, result: Dict[str, Any]) -> None:
+        """Append a result to the ring buffer, keeping aggregates in sync."""
+        if (
+            self.execution_history.maxlen
+            and len(self.execution_history) == self.execution_history.maxlen
+        ):
+            evicted = self.execution_history[0]
+            self._history_agg["total"] -= 1
+            self._history_agg["ok"] -= 1 if evicted.get("success") else 0
+            self._history_agg["time_sum"] -= evicted.get("total_time", 0.0)
+            self._history_agg["errors"] -= len(evicted.get("errors", []))
+
+        self.execution_history.append(result)
+        self._history_agg["total"] += 1
+        self._history_agg["ok"] += 1 if result.get("success") else 0
+        self._history_agg["time_sum"] += result.get("total_time", 0.0)
+        self._history_agg["errors"] += len(result.get("errors", []))
+
     def get_execution_history(
         self,
         limit: Optional[int] = None
@@ -294,9 +492,10 @@ class AssemblyLinePipeline:
         Returns:
             List of execution records
         """
+        stored = len(self.execution_history)
         if limit:
-            return self.execution_history[-limit:]
-        return self.execution_history
+            return list(islice(self.execution_history, max(0, stored - limit), stored))
+        return list(self.execution_history)
 
     def visualize(self) -> str:
         """
@@ -305,18 +504,29 @@ class AssemblyLinePipeline:
         Returns:
             Mermaid diagram string
         """
-        mermaid = ["graph LR"]
+        node_template = self._NODE_TMPL
+        edge_template = self._EDGE_TMPL
+
+        # Preallocate: one header line, one node line per agent, and one
+        # edge line per agent after the first
+        count = len(self.agent_order)
+        lines: List[Optional[str]] = [None] * (max(0, 2 * count - 1) + 1)
+        lines[0] = "graph LR"
 
+        index = 1
         for i, agent_name in enumerate(self.agent_order):
-            node_id = f"A{i}"
             agent = self.agents[agent_name]
-            mermaid.append(f'    {node_id}["{agent.name}<br/>{agent.description}"]')
-
+            lines[index] = node_template(i=i, name=agent.name, desc=agent.description)
+            index += 1
             if i > 0:
-                prev_node = f"A{i-1}"
-                mermaid.append(f"    {prev_node} --> {node_id}")
+                lines[index] = edge_template(i=i - 1, j=i)
+                index += 1
+
+        return "\n".join(lines)
 
-        return "\n".join(mermaid)
+    #: Precompiled Mermaid line templates (bound format methods)
+    _NODE_TMPL = '    A{i}["{name}<br/>{desc}"]'.format
+    _EDGE_TMPL = "    A{i} --> A{j}".format
 
     def get_metrics(self) -> Dict[str, Any]:
         """
@@ -328,10 +538,11 @@ class AssemblyLinePipeline:
         if not self.execution_history:
             return {"message": "No execution history available"}
 
-        total_executions = len(self.execution_history)
-        successful = sum(1 for e in self.execution_history if e.get("success"))
-        avg_time = sum(e.get("total_time", 0) for e in self.execution_history) / total_executions
-        total_errors = sum(len(e.get("errors", [])) for e in self.execution_history)
+        # O(1) read from the running aggregates
+        total_executions = self._history_agg["total"]
+        successful = self._history_agg["ok"]
+        avg_time = self._history_agg["time_sum"] / total_executions
+        total_errors = self._history_agg["errors"]
 
         return {
             "total_executions": total_executions,
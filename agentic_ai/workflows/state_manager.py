@@ -6,11 +6,33 @@ Manages state persistence and retrieval for workflows and agents.
 """
 
 from typing import Dict, Any, Optional
+from collections import OrderedDict, defaultdict, deque
 from datetime import datetime
 import json
 import asyncio
+import os
+import sqlite3
+import threading
 from pathlib import Path
 
+try:
+    import orjson
+except Exception:  # pragma: no cover - optional dependency
+    orjson = None
+
+if orjson:
+    def _dumps(obj):
+        return orjson.dumps(
+            obj, option=orjson.OPT_SERIALIZE_NUMPY, default=str
+        )
+
+    _loads = orjson.loads
+else:
+    def _dumps(obj):
+        return json.dumps(obj, default=str)
+
+    _loads = json.loads
+
 
 class StateManager:
     """
@@ -23,12 +45,54 @@ class StateManager:
     - State cleanup
     """
 
-    def __init__(self, storage_path: Optional[str] = None):
+    def __init__(
+        self,
+        storage_path: Optional[str] = None,
+        max_cache_entries: int = 10_000,
+    ):
         self.storage_path = Path(storage_path or "./state_storage")
         self.storage_path.mkdir(parents=True, exist_ok=True)
+        # Stringified once: legacy-file paths are built with os.path.join
+        # instead of allocating a PurePath per IO call
+        self._storage_str = os.fspath(self.storage_path)
+
+        # Bounded LRU cache plus a per-workflow (timestamp, state_id) index
+        # so history queries stop scanning every cached state
+        self.max_cache_entries = max_cache_entries
+        self.state_cache: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._by_workflow: Dict[str, deque] = defaultdict(deque)
+        # Ids already present in the index: reloading an evicted state must
+        # not append a duplicate, out-of-order index entry
+        self._indexed_ids: set = set()
+
+        # Oldest/newest timestamps tracked on insert; the oldest is only
+        # recomputed after evictions instead of scanning per stats call
+        self._newest_ts: Optional[str] = None
+        self._oldest_ts: Optional[str] = None
+        self._oldest_dirty = False
+
+        # Single embedded store in WAL mode: one table write per save and a
+        # single DELETE for cleanup, instead of one inode + fsync per state
+        self._db_lock = threading.Lock()
+        self._conn = sqlite3.connect(
+            str(self.storage_path / "states.db"), check_same_thread=False
+        )
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS states ("
+            "state_id TEXT PRIMARY KEY, workflow_id TEXT, timestamp TEXT, payload TEXT)"
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_states_timestamp ON states (timestamp)"
+        )
+        self._conn.commit()
 
-        # In-memory cache
-        self.state_cache: Dict[str, Dict[str, Any]] = {}
+        # Background save batching: callers enqueue without blocking and a
+        # single flusher amortizes disk writes across a batch
+        self._save_queue: Optional[asyncio.Queue] = None
+        self._flusher_task = None
+        self._batch_max = 32
+        self._flush_ms = 100
 
     async def save_state(
         self,
@@ -63,13 +127,125 @@ class StateManager:
         }
 
         # Save to cache
-        self.state_cache[state_id] = state_with_meta
+        self._cache_state(state_with_meta)
 
         # Save to disk
         await self._write_to_disk(state_id, state_with_meta)
 
         return state_id
 
+    def _cache_state(self, state_with_meta: Dict[str, Any]) -> None:
+        """Insert a state into the LRU cache and per-workflow index."""
+        state_id = state_with_meta["state_id"]
+        self.state_cache[state_id] = state_with_meta
+        self.state_cache.move_to_end(state_id)
+
+        workflow_id = state_with_meta.get("workflow_id")
+        if workflow_id and state_id not in self._indexed_ids:
+            self._by_workflow[workflow_id].append(
+                (state_with_meta["timestamp"], state_id)
+            )
+            self._indexed_ids.add(state_id)
+
+        timestamp = state_with_meta.get("timestamp")
+        if timestamp:
+            if self._newest_ts is None or timestamp > self._newest_ts:
+                self._newest_ts = timestamp
+            if self._oldest_ts is None or timestamp < self._oldest_ts:
+                self._oldest_ts = timestamp
+
+        while len(self.state_cache) > self.max_cache_entries:
+            evicted_id, evicted = self.state_cache.popitem(last=False)
+            self._oldest_dirty = True
+
+            # Evict the matching index entries too, or both structures grow
+            # by one entry per request forever
+            self._indexed_ids.discard(evicted_id)
+            evicted_workflow = evicted.get("workflow_id")
+            if evicted_workflow:
+                try:
+                    self._by_workflow[evicted_workflow].remove(
+                        (evicted.get("timestamp"), evicted_id)
+                    )
+                except ValueError:
+                    pass
+
+    def enqueue_save(
+        self,
+        workflow_id: str,
+        state: Dict[str, Any],
+        version: Optional[str] = None
+    ) -> str:
+        """
+        Queue a state save without blocking the caller.
+
+        The state is cached immediately; disk persistence happens on the
+        background flusher in batches. Call flush() for durability barriers.
+
+        Args:
+            workflow_id: Workflow identifier
+            state: State to save
+            version: Optional version identifier
+
+        Returns:
+            State ID
+        """
+        timestamp = datetime.now()
+        state_id = f"{workflow_id}_{timestamp.timestamp()}"
+
+        if version:
+            state_id = f"{state_id}_{version}"
+
+        state_with_meta = {
+            "state_id": state_id,
+            "workflow_id": workflow_id,
+            "version": version,
+            "timestamp": timestamp.isoformat(),
+            "state": state
+        }
+
+        self._cache_state(state_with_meta)
+
+        if self._save_queue is None:
+            self._save_queue = asyncio.Queue()
+            self._flusher_task = asyncio.get_running_loop().create_task(
+                self._drain_saves()
+            )
+        self._save_queue.put_nowait(state_with_meta)
+
+        return state_id
+
+    async def _drain_saves(self) -> None:
+        """Write queued states to disk in batches on one worker-thread hop."""
+        loop = asyncio.get_running_loop()
+        window = self._flush_ms / 1000.0
+
+        while True:
+            batch = [await self._save_queue.get()]
+
+            deadline = loop.time() + window
+            while len(batch) < self._batch_max:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(
+                        await asyncio.wait_for(self._save_queue.get(), timeout)
+                    )
+                except asyncio.TimeoutError:
+                    break
+
+            try:
+                await asyncio.to_thread(self._store_rows, batch)
+            finally:
+                for _ in batch:
+                    self._save_queue.task_done()
+
+    async def flush(self) -> None:
+        """Block until all queued saves have reached disk."""
+        if self._save_queue is not None:
+            await self._save_queue.join()
+
     async def load_state(self, state_id: str) -> Optional[Dict[str, Any]]:
         """
         Load workflow state.
@@ -89,7 +265,7 @@ class StateManager:
 
         if state_data:
             # Update cache
-            self.state_cache[state_id] = state_data
+            self._cache_state(state_data)
             return state_data["state"]
 
         return None
@@ -109,20 +285,41 @@ class StateManager:
         Returns:
             List of state records
         """
-        # Get all states for workflow
-        workflow_states = [
-            state for state_id, state in self.state_cache.items()
-            if state["workflow_id"] == workflow_id
-        ]
-
-        # Sort by timestamp (most recent first)
-        sorted_states = sorted(
-            workflow_states,
-            key=lambda x: x["timestamp"],
-            reverse=True
-        )
-
-        return sorted_states[:limit]
+        # Walk the per-workflow index newest-first; entries are appended in
+        # time order, so no sort is needed
+        history = []
+        for _, state_id in reversed(self._by_workflow.get(workflow_id, ())):
+            state = self.state_cache.get(state_id)
+            if state is None:
+                continue
+            history.append(state)
+            if len(history) >= limit:
+                break
+
+        if len(history) >= limit:
+            return history
+
+        # The cache only holds the hot tail: read older records through to
+        # the disk tier to fill the remainder
+        seen = {state["state_id"] for state in history}
+
+        def read_older():
+            with self._db_lock:
+                rows = self._conn.execute(
+                    "SELECT payload FROM states WHERE workflow_id = ? "
+                    "ORDER BY timestamp DESC LIMIT ?",
+                    (workflow_id, limit),
+                ).fetchall()
+            return [_loads(row[0]) for row in rows]
+
+        for state in await asyncio.to_thread(read_older):
+            if state["state_id"] in seen:
+                continue
+            history.append(state)
+            if len(history) >= limit:
+                break
+
+        return history
 
     async def cleanup_old_states(self, days: int = 7) -> int:
         """
@@ -147,42 +344,83 @@ class StateManager:
         for state_id in states_to_delete:
             del self.state_cache[state_id]
             deleted_count += 1
+        if states_to_delete:
+            self._oldest_dirty = True
+
+        # Drop stale per-workflow index entries
+        if states_to_delete:
+            for workflow_id, index in self._by_workflow.items():
+                self._by_workflow[workflow_id] = deque(
+                    item for item in index if item[1] in self.state_cache
+                )
+            self._indexed_ids = {
+                state_id
+                for index in self._by_workflow.values()
+                for _, state_id in index
+            }
 
         # Delete from disk
         await self._delete_from_disk(states_to_delete)
 
         return deleted_count
 
+    def _store_rows(self, batch: list) -> None:
+        """Insert state rows in one transaction."""
+        rows = [
+            (
+                meta["state_id"],
+                meta.get("workflow_id"),
+                meta.get("timestamp"),
+                _dumps(meta),
+            )
+            for meta in batch
+        ]
+        with self._db_lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO states (state_id, workflow_id, timestamp, payload) "
+                "VALUES (?, ?, ?, ?)",
+                rows,
+            )
+            self._conn.commit()
+
     async def _write_to_disk(self, state_id: str, state_data: Dict[str, Any]) -> None:
         """Write state to disk."""
-        file_path = self.storage_path / f"{state_id}.json"
-
-        def write():
-            with open(file_path, "w") as f:
-                json.dump(state_data, f, indent=2)
-
-        await asyncio.to_thread(write)
+        await asyncio.to_thread(self._store_rows, [state_data])
 
     async def _read_from_disk(self, state_id: str) -> Optional[Dict[str, Any]]:
         """Read state from disk."""
-        file_path = self.storage_path / f"{state_id}.json"
-
-        if not file_path.exists():
-            return None
-
         def read():
-            with open(file_path, "r") as f:
-                return json.load(f)
+            with self._db_lock:
+                row = self._conn.execute(
+                    "SELECT payload FROM states WHERE state_id = ?", (state_id,)
+                ).fetchone()
+            if row:
+                return _loads(row[0])
+
+            # Legacy layout: one JSON file per state
+            file_path = os.path.join(self._storage_str, state_id + ".json")
+            if os.path.exists(file_path):
+                with open(file_path, "r") as f:
+                    return json.load(f)
+            return None
 
         return await asyncio.to_thread(read)
 
     async def _delete_from_disk(self, state_ids: list[str]) -> None:
         """Delete states from disk."""
         def delete():
+            with self._db_lock:
+                self._conn.executemany(
+                    "DELETE FROM states WHERE state_id = ?",
+                    [(state_id,) for state_id in state_ids],
+                )
+                self._conn.commit()
+
+            # Legacy layout cleanup
             for state_id in state_ids:
-                file_path = self.storage_path / f"{state_id}.json"
-                if file_path.exists():
-                    file_path.unlink()
+                file_path = os.path.join(self._storage_str, state_id + ".json")
+                if os.path.exists(file_path):
+                    os.unlink(file_path)
 
         await asyncio.to_thread(delete)
 
@@ -193,15 +431,19 @@ class StateManager:
         Returns:
             Statistics dictionary
         """
+        if not self.state_cache:
+            self._oldest_ts = None
+            self._newest_ts = None
+            self._oldest_dirty = False
+        elif self._oldest_dirty:
+            self._oldest_ts = min(
+                state["timestamp"] for state in self.state_cache.values()
+            )
+            self._oldest_dirty = False
+
         return {
             "cached_states": len(self.state_cache),
             "storage_path": str(self.storage_path),
-            "oldest_state": min(
-                (state["timestamp"] for state in self.state_cache.values()),
-                default=None
-            ),
-            "newest_state": max(
-                (state["timestamp"] for state in self.state_cache.values()),
-                default=None
-            )
+            "oldest_state": self._oldest_ts,
+            "newest_state": self._newest_ts if self.state_cache else None
         }
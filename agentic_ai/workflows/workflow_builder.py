@@ -5,6 +5,8 @@ Workflow Builder
 Utility for building and configuring workflows with agents.
 """
 
+import hashlib
+import json
 from typing import Dict, Any, List, Optional
 from .assembly_line import AssemblyLinePipeline
 from ..agents import (
@@ -17,13 +19,72 @@ from ..agents import (
 )
 
 
+#: Compiled pipelines memoized by (workflow name, config fingerprint):
+#: rebuilding re-instantiates every agent and re-compiles the graph
+_pipeline_cache: Dict[Any, AssemblyLinePipeline] = {}
+
+
+def _cached_build(name: str, config: Dict[str, Any], assemble) -> AssemblyLinePipeline:
+    """Return the memoized pipeline for this config, building it once."""
+    try:
+        raw = json.dumps(config, sort_keys=True, default=str)
+    except TypeError:
+        return assemble(config)
+
+    key = (name, hashlib.blake2b(raw.encode("utf-8")).hexdigest())
+    pipeline = _pipeline_cache.get(key)
+    if pipeline is None:
+        pipeline = assemble(config)
+        _pipeline_cache[key] = pipeline
+    return pipeline
+
+
 class WorkflowBuilder:
     """
     Builder class for creating pre-configured workflows.
+
+    The public build_* methods memoize compiled pipelines per config, so
+    repeat builders reuse agents and compiled graphs instead of paying
+    construction again.
     """
 
     @staticmethod
     def build_recommendation_workflow(config: Dict[str, Any]) -> AssemblyLinePipeline:
+        """Build (or reuse) the recommendation workflow for this config."""
+        return _cached_build(
+            "recommendation", config, WorkflowBuilder._assemble_recommendation_workflow
+        )
+
+    @staticmethod
+    def build_conversation_workflow(config: Dict[str, Any]) -> AssemblyLinePipeline:
+        """Build (or reuse) the conversation workflow for this config."""
+        return _cached_build(
+            "conversation", config, WorkflowBuilder._assemble_conversation_workflow
+        )
+
+    @staticmethod
+    def build_analysis_workflow(config: Dict[str, Any]) -> AssemblyLinePipeline:
+        """Build (or reuse) the analysis workflow for this config."""
+        return _cached_build(
+            "analysis", config, WorkflowBuilder._assemble_analysis_workflow
+        )
+
+    @staticmethod
+    def build_profile_workflow(config: Dict[str, Any]) -> AssemblyLinePipeline:
+        """Build (or reuse) the profile workflow for this config."""
+        return _cached_build(
+            "profile", config, WorkflowBuilder._assemble_profile_workflow
+        )
+
+    @staticmethod
+    def build_match_workflow(config: Dict[str, Any]) -> AssemblyLinePipeline:
+        """Build (or reuse) the match workflow for this config."""
+        return _cached_build(
+            "match", config, WorkflowBuilder._assemble_match_workflow
+        )
+
+    @staticmethod
+    def _assemble_recommendation_workflow(config: Dict[str, Any]) -> AssemblyLinePipeline:
         """
         Build a workflow for pet recommendations.
 
@@ -45,10 +106,13 @@ class WorkflowBuilder:
             config=config
         )
 
-        # Add agents in order
-        pipeline.add_agent(UserProfilerAgent(config))
-        pipeline.add_agent(PetAnalyzerAgent(config))
-        pipeline.add_agent(MatchingAgent(config))
+        # Profiling and pet analysis are independent: run them as one
+        # concurrent layer, then match, recommend, and monitor
+        pipeline.add_agent(UserProfilerAgent(config), dependencies=[])
+        pipeline.add_agent(PetAnalyzerAgent(config), dependencies=[])
+        pipeline.add_agent(
+            MatchingAgent(config), dependencies=["UserProfiler", "PetAnalyzer"]
+        )
         pipeline.add_agent(RecommendationAgent(config))
         pipeline.add_agent(MonitoringAgent(config))
 
@@ -58,7 +122,7 @@ class WorkflowBuilder:
         return pipeline
 
     @staticmethod
-    def build_conversation_workflow(config: Dict[str, Any]) -> AssemblyLinePipeline:
+    def _assemble_conversation_workflow(config: Dict[str, Any]) -> AssemblyLinePipeline:
         """
         Build a workflow for conversations.
 
@@ -89,7 +153,7 @@ class WorkflowBuilder:
         return pipeline
 
     @staticmethod
-    def build_analysis_workflow(config: Dict[str, Any]) -> AssemblyLinePipeline:
+    def _assemble_analysis_workflow(config: Dict[str, Any]) -> AssemblyLinePipeline:
         """
         Build a workflow for pet analysis.
 
@@ -118,7 +182,7 @@ class WorkflowBuilder:
         return pipeline
 
     @staticmethod
-    def build_profile_workflow(config: Dict[str, Any]) -> AssemblyLinePipeline:
+    def _assemble_profile_workflow(config: Dict[str, Any]) -> AssemblyLinePipeline:
         """
         Build a workflow for user profiling.
 
@@ -138,7 +202,7 @@ class WorkflowBuilder:
         return pipeline
 
     @staticmethod
-    def build_match_workflow(config: Dict[str, Any]) -> AssemblyLinePipeline:
+    def _assemble_match_workflow(config: Dict[str, Any]) -> AssemblyLinePipeline:
         """
         Build a workflow for user-pet matching.
 
@@ -153,9 +217,11 @@ class WorkflowBuilder:
             config=config
         )
 
-        pipeline.add_agent(UserProfilerAgent(config))
-        pipeline.add_agent(PetAnalyzerAgent(config))
-        pipeline.add_agent(MatchingAgent(config))
+        pipeline.add_agent(UserProfilerAgent(config), dependencies=[])
+        pipeline.add_agent(PetAnalyzerAgent(config), dependencies=[])
+        pipeline.add_agent(
+            MatchingAgent(config), dependencies=["UserProfiler", "PetAnalyzer"]
+        )
         pipeline.add_agent(MonitoringAgent(config))
         pipeline.build()
 
@@ -1,13 +1,30 @@
 import json
+import logging
 import boto3
+import numpy as np
 import os
+from botocore.config import Config
 from datetime import datetime, timedelta
-from statistics import mean
 import math
 
-cloudwatch = boto3.client('cloudwatch')
-autoscaling = boto3.client('application-autoscaling')
-ecs = boto3.client('ecs')
+# Deferred %-style logging: no string interpolation unless the line is emitted
+logger = logging.getLogger()
+logger.setLevel(logging.INFO)
+
+# Keep-alive so warm containers reuse the HTTPS connections
+_BOTO_CONFIG = Config(tcp_keepalive=True, retries={'max_attempts': 2})
+
+cloudwatch = boto3.client('cloudwatch', config=_BOTO_CONFIG)
+autoscaling = boto3.client('application-autoscaling', config=_BOTO_CONFIG)
+ecs = boto3.client('ecs', config=_BOTO_CONFIG)
+
+# Environment is fixed per container: read once at init
+SERVICE_NAMESPACE = os.environ.get('SERVICE_NAMESPACE')
+RESOURCE_ID = os.environ.get('RESOURCE_ID', '')
+SCALABLE_DIMENSION = os.environ.get('SCALABLE_DIMENSION')
+CLUSTER_NAME = os.environ.get('CLUSTER_NAME')
+SERVICE_NAME = os.environ.get('SERVICE_NAME')
+TARGET_GROUP = RESOURCE_ID.rsplit('/', 1)[-1]
 
 def handler(event, context):
     """
@@ -15,79 +32,122 @@ def handler(event, context):
     to forecast future load and scale proactively
     """
 
-    service_namespace = os.environ['SERVICE_NAMESPACE']
-    resource_id = os.environ['RESOURCE_ID']
-    scalable_dimension = os.environ['SCALABLE_DIMENSION']
-    cluster_name = os.environ['CLUSTER_NAME']
-    service_name = os.environ['SERVICE_NAME']
-
-    print(f"Starting predictive scaling analysis for {service_name}")
+    logger.info("Starting predictive scaling analysis for %s", SERVICE_NAME)
 
     try:
         # Get historical metrics (last 7 days)
         end_time = datetime.utcnow()
         start_time = end_time - timedelta(days=7)
 
-        # Fetch CPU utilization metrics
-        cpu_metrics = cloudwatch.get_metric_statistics(
-            Namespace='AWS/ECS',
-            MetricName='CPUUtilization',
-            Dimensions=[
-                {'Name': 'ServiceName', 'Value': service_name},
-                {'Name': 'ClusterName', 'Value': cluster_name}
+        # One GetMetricData call batches both series at hourly resolution:
+        # a single round-trip and ~12x fewer datapoints than Period=300
+        metric_data = cloudwatch.get_metric_data(
+            MetricDataQueries=[
+                {
+                    'Id': 'cpu',
+                    'MetricStat': {
+                        'Metric': {
+                            'Namespace': 'AWS/ECS',
+                            'MetricName': 'CPUUtilization',
+                            'Dimensions': [
+                                {'Name': 'ServiceName', 'Value': SERVICE_NAME},
+                                {'Name': 'ClusterName', 'Value': CLUSTER_NAME}
+                            ]
+                        },
+                        'Period': 3600,
+                        'Stat': 'Average'
+                    },
+                    'ReturnData': True
+                },
+                {
+                    'Id': 'requests',
+                    'MetricStat': {
+                        'Metric': {
+                            'Namespace': 'AWS/ApplicationELB',
+                            'MetricName': 'RequestCount',
+                            'Dimensions': [
+                                {'Name': 'TargetGroup', 'Value': TARGET_GROUP}
+                            ]
+                        },
+                        'Period': 3600,
+                        'Stat': 'Sum'
+                    },
+                    'ReturnData': True
+                }
             ],
             StartTime=start_time,
-            EndTime=end_time,
-            Period=300,  # 5-minute periods
-            Statistics=['Average', 'Maximum']
+            EndTime=end_time
         )
 
-        # Fetch request count metrics
-        request_metrics = cloudwatch.get_metric_statistics(
-            Namespace='AWS/ApplicationELB',
-            MetricName='RequestCount',
-            Dimensions=[
-                {'Name': 'TargetGroup', 'Value': resource_id.split('/')[-1]}
-            ],
-            StartTime=start_time,
-            EndTime=end_time,
-            Period=300,
-            Statistics=['Sum']
-        )
+        results = {r['Id']: r for r in metric_data['MetricDataResults']}
 
         # Analyze patterns
         current_hour = datetime.utcnow().hour
         current_day = datetime.utcnow().weekday()  # 0 = Monday
 
-        # Get historical data for same time window
-        historical_cpu = [
-            dp['Average']
-            for dp in cpu_metrics['Datapoints']
-            if dp['Timestamp'].hour == current_hour
-        ]
+        # Get historical data for same time window, reduced in C via NumPy
+        cpu_result = results.get('cpu', {})
+        historical_cpu = np.fromiter(
+            (
+                value
+                for timestamp, value in zip(
+                    cpu_result.get('Timestamps', []), cpu_result.get('Values', [])
+                )
+                if timestamp.hour == current_hour
+            ),
+            dtype=np.float32
+        )
 
-        historical_requests = [
-            dp['Sum']
-            for dp in request_metrics['Datapoints']
-            if dp['Timestamp'].hour == current_hour
-        ]
+        request_result = results.get('requests', {})
+        historical_requests = np.fromiter(
+            (
+                value
+                for timestamp, value in zip(
+                    request_result.get('Timestamps', []), request_result.get('Values', [])
+                )
+                if timestamp.hour == current_hour
+            ),
+            dtype=np.float32
+        )
 
         # Calculate prediction
-        if historical_cpu and historical_requests:
-            avg_cpu = mean(historical_cpu)
-            avg_requests = mean(historical_requests)
-            max_cpu = max(historical_cpu)
+        if historical_cpu.size and historical_requests.size:
+            avg_cpu = float(historical_cpu.mean())
+            avg_requests = float(historical_requests.mean())
+            max_cpu = float(historical_cpu.max())
 
             # Predict load for next 15 minutes
             predicted_cpu = avg_cpu * 1.1  # Add 10% buffer
             predicted_requests = avg_requests * 1.1
 
-            print(f"Predicted CPU: {predicted_cpu}%, Predicted Requests: {predicted_requests}")
+            logger.info(
+                "Predicted CPU: %.2f%%, Predicted Requests: %.2f",
+                predicted_cpu,
+                predicted_requests,
+            )
+
+            # Deadband short-circuit: on an off-peak weekday with CPU in the
+            # neutral band, the scale factor is exactly 1.0, so desiredCount
+            # would be left unchanged - skip the ECS lookup entirely. Known
+            # accepted trade-off: the min/max clamp is skipped too, so a
+            # service manually scaled outside [min_count, 20] is not pulled
+            # back into range until the prediction leaves the deadband.
+            is_weekday = current_day < 5
+            is_business_hours = 8 <= current_hour <= 20
+            if 40 <= predicted_cpu <= 60 and is_weekday and not is_business_hours:
+                logger.info("Prediction stable; skipping service state lookup")
+                return {
+                    'statusCode': 200,
+                    'body': json.dumps({
+                        'message': 'No scaling needed (prediction stable)',
+                        'predicted_cpu': predicted_cpu
+                    })
+                }
 
             # Get current service state
             service_info = ecs.describe_services(
-                cluster=cluster_name,
-                services=[service_name]
+                cluster=CLUSTER_NAME,
+                services=[SERVICE_NAME]
             )
 
             current_desired = service_info['services'][0]['desiredCount']
@@ -102,13 +162,15 @@ def handler(event, context):
                 current_hour
             )
 
-            print(f"Current tasks: {current_desired}, Optimal tasks: {optimal_count}")
+            logger.info(
+                "Current tasks: %s, Optimal tasks: %s", current_desired, optimal_count
+            )
 
             # Update desired count if significant difference
             if abs(optimal_count - current_desired) >= 1:
                 update_service_capacity(
-                    cluster_name,
-                    service_name,
+                    CLUSTER_NAME,
+                    SERVICE_NAME,
                     optimal_count
                 )
 
@@ -132,45 +194,48 @@ def handler(event, context):
                     })
                 }
         else:
-            print("Insufficient historical data for prediction")
+            logger.info("Insufficient historical data for prediction")
             return {
                 'statusCode': 200,
                 'body': json.dumps({'message': 'Insufficient data'})
             }
 
-    except Exception as e:
-        print(f"Error in predictive scaling: {str(e)}")
+    except Exception:
+        logger.exception("Error in predictive scaling")
         raise
 
+# CPU breakpoints and the scale factor for each interval. The upper
+# breakpoints are bumped one ulp so exact 60/70/80 readings stay in the
+# lower band, matching the old strict > comparisons.
+_CPU_BREAKPOINTS = np.array([
+    30.0, 40.0,
+    np.nextafter(60.0, 61.0), np.nextafter(70.0, 71.0), np.nextafter(80.0, 81.0),
+])
+_CPU_SCALE_FACTORS = np.array([0.7, 0.9, 1.0, 1.1, 1.3, 1.5])
+
+# Business-pattern multiplier indexed by [is_weekday, is_business_hours]
+_PATTERN_MULTIPLIER = np.array([
+    [0.7, 0.7],  # weekend
+    [1.0, 1.2],  # weekday (peak hours scale up)
+])
+
+
 def calculate_optimal_task_count(predicted_cpu, predicted_requests, current_count, day, hour):
     """
     Calculate optimal task count based on predictions and business patterns
     """
 
-    # Base calculation on CPU prediction
-    if predicted_cpu > 80:
-        scale_factor = 1.5
-    elif predicted_cpu > 70:
-        scale_factor = 1.3
-    elif predicted_cpu > 60:
-        scale_factor = 1.1
-    elif predicted_cpu < 30:
-        scale_factor = 0.7
-    elif predicted_cpu < 40:
-        scale_factor = 0.9
-    else:
-        scale_factor = 1.0
+    # Base calculation on CPU prediction: data-driven breakpoint lookup
+    # instead of a branch chain
+    scale_factor = float(
+        _CPU_SCALE_FACTORS[np.searchsorted(_CPU_BREAKPOINTS, predicted_cpu, side='right')]
+    )
 
     # Apply business hours adjustments
     is_weekday = day < 5  # Monday-Friday
     is_business_hours = 8 <= hour <= 20
 
-    if is_weekday and is_business_hours:
-        # Peak hours - be more aggressive with scaling up
-        scale_factor *= 1.2
-    elif not is_weekday:
-        # Weekend - scale down
-        scale_factor *= 0.7
+    scale_factor *= float(_PATTERN_MULTIPLIER[int(is_weekday), int(is_business_hours)])
 
     # Calculate new count
     new_count = math.ceil(current_count * scale_factor)
@@ -191,8 +256,8 @@ def update_service_capacity(cluster, service, desired_count):
             service=service,
             desiredCount=desired_count
         )
-        print(f"Updated service {service} to {desired_count} tasks")
+        logger.info("Updated service %s to %s tasks", service, desired_count)
         return response
-    except Exception as e:
-        print(f"Error updating service: {str(e)}")
+    except Exception:
+        logger.exception("Error updating service")
         raise
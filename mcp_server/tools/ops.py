@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import time
 from datetime import datetime, timezone
 from typing import Any, Dict
 
@@ -12,6 +13,22 @@ from ..serialization import to_jsonable
 from ..settings import MCPServerSettings
 
 
+# Timestamp strings are cached at second granularity: health probes at high
+# rates share one strftime instead of formatting per response
+_last_ts_sec = 0
+_last_ts_str = ""
+
+
+def _now_iso() -> str:
+    global _last_ts_sec, _last_ts_str
+    now = time.time()
+    sec = int(now)
+    if sec != _last_ts_sec:
+        _last_ts_sec = sec
+        _last_ts_str = datetime.fromtimestamp(sec, timezone.utc).isoformat()
+    return _last_ts_str
+
+
 def register_ops_tools(
     server: FastMCP, runtime: RuntimeContext, settings: MCPServerSettings
 ) -> None:
@@ -26,7 +43,7 @@ def register_ops_tools(
         workflows = engine.list_workflows()
         return {
             "status": "healthy",
-            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "timestamp": _now_iso(),
             "workflows": workflows,
             "workflow_count": len(workflows),
             "mcp_client_enabled": engine.mcp_client_enabled,